@@ -0,0 +1,159 @@
+# balance.py
+
+"""
+Vectorized Monte Carlo balance matrix.
+
+Simulates fights for every character class x enemy x level at once, storing each fight as
+a row in NumPy arrays of HP, attack and defense instead of looping over Python objects.
+The player uses a basic attack every turn, with the same roll as Character.attack_enemy
+(attack +/- 3, 20% chance to double), and the enemy hits back like Enemy.attack_player
+(max(1, attack - defense)).
+
+Requires NumPy:
+    python balance.py --fights 100000 --levels 1-50 --csv balance.csv
+"""
+
+import argparse
+import csv
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for balance sweeps, not to play the game
+    np = None
+
+from enemy import enemy_templates
+from simulate import CHARACTER_CLASSES, build_character
+
+BATCH_SIZE = 2_000_000  # Fights simulated per vectorized pass
+
+
+class BalanceMatrix:
+    def __init__(self, classes, enemies, levels, fights, wins, total_turns):
+        self.classes = classes
+        self.enemies = enemies
+        self.levels = levels
+        self.fights = fights  # Fights per cell
+        shape = (len(classes), len(enemies), len(levels))
+        self.win_probability = (wins / fights).reshape(shape)
+        self.expected_turns = (total_turns / fights).reshape(shape)
+
+    def rows(self):
+        """Yield (class, enemy, level, win probability, expected turns) for every cell."""
+        for c, char_class in enumerate(self.classes):
+            for e, enemy_name in enumerate(self.enemies):
+                for l, level in enumerate(self.levels):
+                    yield (char_class, enemy_name, level,
+                           float(self.win_probability[c, e, l]), float(self.expected_turns[c, e, l]))
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["class", "enemy", "level", "win_probability", "expected_turns"])
+            writer.writerows(self.rows())
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("balance.py needs NumPy. Install it with: pip install numpy")
+
+
+def _simulate(p_hp, p_atk, p_def, e_hp, e_atk, e_def, rng):
+    """Fight every row to the end. Returns (won, turns) arrays."""
+    p_hp = p_hp.copy()
+    e_hp = e_hp.copy()
+    turns = np.zeros(len(p_hp), dtype=np.int64)
+    enemy_damage = np.maximum(1, e_atk - p_def)  # Player defense never changes mid-fight here
+
+    active = np.arange(len(p_hp))
+    while active.size:
+        damage = p_atk[active] + rng.integers(-3, 4, size=active.size)
+        crit = rng.random(active.size) < 0.2
+        damage[crit] *= 2
+        e_hp[active] = np.maximum(e_hp[active] - damage, 0)
+        turns[active] += 1
+
+        enemy_alive = e_hp[active] > 0
+        hit = active[enemy_alive]
+        p_hp[hit] -= enemy_damage[hit]
+
+        # Keep only fights where both sides are still standing
+        active = hit[p_hp[hit] > 0]
+
+    won = (p_hp > 0) & (e_hp <= 0)
+    return won, turns
+
+
+def evaluate(fights=10000, levels=range(1, 51), classes=CHARACTER_CLASSES, enemies=None,
+             seed=None, batch_size=BATCH_SIZE):
+    """
+    Build the win-probability / expected-turns matrix for classes x enemies x levels,
+    simulating `fights` fights per cell.
+    """
+    _require_numpy()
+    levels = list(levels)
+    classes = list(classes)
+    if enemies is None:
+        enemies = list(enemy_templates.values())
+    rng = np.random.default_rng(seed)
+
+    # Flatten the (class, enemy, level) grid into cells with one stat row each
+    p_hp, p_atk, p_def, e_hp, e_atk, e_def = ([] for _ in range(6))
+    for char_class in classes:
+        for enemy in enemies:
+            for level in levels:
+                player = build_character(char_class, level)
+                p_hp.append(player.hp)
+                p_atk.append(player.attack)
+                p_def.append(player.defense)
+                e_hp.append(enemy.hp)
+                e_atk.append(enemy.attack)
+                e_def.append(enemy.defense)
+    stats = [np.array(column, dtype=np.int64) for column in (p_hp, p_atk, p_def, e_hp, e_atk, e_def)]
+    n_cells = len(stats[0])
+
+    wins = np.zeros(n_cells)
+    total_turns = np.zeros(n_cells)
+    per_pass = min(fights, batch_size)
+    cells_per_batch = max(1, batch_size // per_pass)
+    for start in range(0, n_cells, cells_per_batch):
+        cell_ids = np.arange(start, min(start + cells_per_batch, n_cells))
+        done = 0
+        while done < fights:
+            count = min(per_pass, fights - done)
+            cells = np.repeat(cell_ids, count)
+            won, turns = _simulate(*(column[cells] for column in stats), rng)
+            wins += np.bincount(cells, weights=won, minlength=n_cells)
+            total_turns += np.bincount(cells, weights=turns, minlength=n_cells)
+            done += count
+
+    return BalanceMatrix(classes, [enemy.name for enemy in enemies], levels, fights, wins, total_turns)
+
+
+def _parse_levels(text):
+    """Parse '1-50' or '1,5,10' into a list of levels."""
+    if "-" in text:
+        low, high = text.split("-", 1)
+        return list(range(int(low), int(high) + 1))
+    return [int(level) for level in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized balance matrix for classes x enemies x levels.")
+    parser.add_argument("--fights", type=int, default=10000, help="Fights per cell")
+    parser.add_argument("--levels", default="1-50", help="Level range like 1-50, or a list like 1,5,10")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--csv", help="Write the full matrix to this CSV file")
+    args = parser.parse_args()
+
+    matrix = evaluate(args.fights, _parse_levels(args.levels), seed=args.seed)
+    if args.csv:
+        matrix.to_csv(args.csv)
+        print(f"Balance matrix written to {args.csv}.")
+    else:
+        for char_class, enemy_name, level, win_probability, expected_turns in matrix.rows():
+            print(f"{char_class:<9} Lv{level:<3} vs {enemy_name:<14} "
+                  f"win {win_probability:7.2%}  turns {expected_turns:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/memory.py
+
+"""
+Memory benchmark for the core game objects.
+
+Reports bytes per instance (measured with tracemalloc) and the process RSS after building
+large populations of Items, Characters and Enemies. Each slotted class is compared with a
+plain dict-backed class holding the same fields, to show what __slots__ saves.
+
+Run from the repository root:
+    python -m benchmarks.memory --items 1000000 --characters 100000
+"""
+
+import argparse
+import gc
+import resource
+import tracemalloc
+
+from character import Character
+from enemy import Enemy
+from inventory import Item
+
+
+class DictItem:
+    """Reference layout: the same fields as Item, stored in a per-instance __dict__."""
+    def __init__(self, name, description, item_type, price=0, attack_bonus=0, defense_bonus=0):
+        self.item_id = name.lower().replace(" ", "_")
+        self.name = name
+        self.description = description
+        self.item_type = item_type
+        self.price = price
+        self.attack_bonus = attack_bonus
+        self.defense_bonus = defense_bonus
+
+
+class DictEnemy:
+    """Reference layout: the same fields as Enemy, stored in a per-instance __dict__."""
+    def __init__(self, name, hp, attack, defense, location, drop_items=None):
+        self.name = name
+        self.hp = hp
+        self.attack = attack
+        self.defense = defense
+        self.location = location
+        self.drop_items = drop_items or []
+
+
+def rss_kib():
+    """Current resident set size in KiB (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(label, count, factory):
+    """Build `count` objects with `factory(i)` and report the memory they use."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_overhead = 8 * count  # The list holding the objects is not part of their cost
+    per_object = (after - before - list_overhead) / count
+    print(f"{label:<32} {count:>9} objects  {per_object:8.1f} bytes each  RSS {rss_kib() / 1024:8.1f} MiB")
+    del objects
+    gc.collect()
+    return per_object
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory per game object.")
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--characters", type=int, default=100_000)
+    parser.add_argument("--enemies", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Shared strings, so only the per-object layout is measured
+    name, description = "Fur Pelt", "Can be sold or traded."
+    print(f"Starting RSS {rss_kib() / 1024:.1f} MiB\n")
+    measure("Item (slots)", args.items, lambda i: Item(name, description, "misc", price=10))
+    measure("Item (dict reference)", args.items, lambda i: DictItem(name, description, "misc", price=10))
+    measure("Enemy (slots)", args.enemies, lambda i: Enemy("Goblin", 30, 10, 2, "Dark Cave"))
+    measure("Enemy (dict reference)", args.enemies, lambda i: DictEnemy("Goblin", 30, 10, 2, "Dark Cave"))
+    measure("Character (with inventory)", args.characters, lambda i: Character("Hero", "Warrior"))
+    print(f"\nPeak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+# benchmarks/suite.py
+
+"""
+Micro-benchmarks for the game's hot paths, checked against stored baselines.
+
+Each benchmark builds its objects once and times a single operation with timeit: combat
+(attack_enemy, exp_reward, gain_experience, area skills, the combat solver), inventory
+handling at sizes from 10 to 100k items, bulk shop orders, save/load round-trips, snapshot
+decoding, location effects, the win-condition check and hordes. Results are compared with
+benchmarks/baseline.json; the run exits with status 1 when any benchmark is slower than its
+baseline by more than the threshold. Horde benchmarks are skipped when NumPy is missing.
+
+Baselines depend on the machine, so each one records the machine type and Python version
+(and, for reference only, the host) it was recorded with. A baseline from a different
+machine type or Python series is refused unless --allow-foreign is given; record one on the
+machine that runs the check. With no baseline at all, the timings are only reported:
+    python -m benchmarks.suite --update-baseline
+    python -m benchmarks.suite
+    python -m benchmarks.suite --filter inventory --threshold 0.5
+    python -m benchmarks.suite --allow-foreign   # compare with a baseline from elsewhere anyway
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+
+import game
+import save_codec
+from catalog import ITEMS
+from character import Character
+from combat_solver import CombatSolver, optimal_action
+from enemy import GOBLIN, Enemy, EnemyPool
+from events import EventBus, use_bus
+from inventory import Item
+from location import locations
+from save_index import SUMMARY_FIELDS
+from shop import Shop
+from world import World
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+THRESHOLD = 0.25  # Allowed slowdown before a benchmark counts as a regression
+INVENTORY_SIZES = (10, 1_000, 100_000)
+
+BENCHMARKS = []  # (name, size, setup); setup(size) returns the operation to time
+
+
+def benchmark(name, sizes=(None,)):
+    """Register a benchmark, once per size."""
+    def register(setup):
+        for size in sizes:
+            BENCHMARKS.append((name, size, setup))
+        return setup
+    return register
+
+
+def key(name, size):
+    return name if size is None else f"{name}[{size}]"
+
+
+def make_player(inventory_size=0):
+    """A Warrior holding `inventory_size` different items plus a large stack of potions."""
+    player = Character("Bench", "Warrior")
+    for i in range(inventory_size):
+        player.inventory.store(Item(f"Trinket {i:06d}", "A benchmark item.", "misc", price=1))
+    player.inventory.store(ITEMS["potion"], 10**9)  # Never runs out while being timed
+    return player
+
+
+# Combat
+
+@benchmark("attack_enemy")
+def bench_attack_enemy(size):
+    player = make_player()
+    enemy = Enemy.from_template(GOBLIN)
+    enemy.hp = 10**12  # Stays alive for every timed call
+    return lambda: player.attack_enemy(enemy)
+
+
+@benchmark("exp_reward")
+def bench_exp_reward(size):
+    enemy = Enemy.from_template(GOBLIN)
+    return enemy.exp_reward
+
+
+@benchmark("gain_experience")
+def bench_gain_experience(size):
+    player = make_player()
+
+    def gain():
+        player.exp = 0
+        player.gain_experience(10)  # Below the level-up threshold
+    return gain
+
+
+@benchmark("gain_experience_level_up")
+def bench_gain_experience_level_up(size):
+    player = make_player()
+
+    def gain():
+        player.level = 1
+        player.exp = 0
+        player.gain_experience(60)  # Crosses the level 1 threshold every time
+    return gain
+
+
+@benchmark("gain_experience_bulk")
+def bench_gain_experience_bulk(size):
+    player = make_player()
+
+    def gain():
+        player.level = 1
+        player.exp = 0
+        player.gain_experience(10**6)  # Worth 22 levels in one call
+    return gain
+
+
+@benchmark("character_at_level_50")
+def bench_character_at_level(size):
+    return lambda: Character("Bench", "Warrior", level=50)
+
+
+@benchmark("use_skill.area", (10, 1_000))
+def bench_area_skill(size):
+    player = Character("Bench", "Mage")
+    world = World(EnemyPool())
+    targets = [world.spawn(GOBLIN, "Dark Cave") for _ in range(size)]
+    for enemy in targets:
+        enemy.hp = 10**12  # Stays alive for every timed call
+    return lambda: player.use_skill("Ice Spike", targets)
+
+
+@benchmark("combat_solver.solve")
+def bench_solver_solve(size):
+    # A full search from scratch: Warrior against Snow Wolf carrying two potions
+    return lambda: CombatSolver(15, 5, 120, 15, 4).solve(120, 45, 2)
+
+
+@benchmark("combat_solver.optimal_action")
+def bench_optimal_action(size):
+    # The autopilot's per-turn cost once the matchup has been solved
+    player = make_player()
+    enemy = Enemy.from_template(GOBLIN)
+    optimal_action(player, enemy)
+    return lambda: optimal_action(player, enemy)
+
+
+@benchmark("horde.area_skill", (1_000, 100_000))
+def bench_horde_area_skill(size):
+    from horde import Horde  # Needs NumPy
+    player = Character("Bench", "Mage")
+    horde = Horde.spawn([GOBLIN], size)
+    horde.hp[:] = 10**12  # Stays alive for every timed call
+
+    def cast():
+        player.level = 1
+        player.exp = 0
+        horde.use_skill(player, "Ice Spike")
+        horde.award(player)
+    return cast
+
+
+@benchmark("horde.award", (1_000, 100_000))
+def bench_horde_award(size):
+    # Finding the fallen and adding up their experience and loot, with the whole horde falling
+    from horde import Horde  # Needs NumPy
+    player = Character("Bench", "Warrior")
+    horde = Horde.spawn([GOBLIN], size)
+    full_hp = horde.hp.copy()
+
+    def award():
+        player.level = 1
+        player.exp = 0
+        horde.hp[:] = 0
+        horde.award(player)
+        horde.hp[:] = full_hp
+        horde.alive[:] = True
+        horde.remaining = size
+    return award
+
+
+# Inventory
+
+@benchmark("inventory.use_item", INVENTORY_SIZES)
+def bench_use_item(size):
+    player = make_player(size)
+    return lambda: player.inventory.use_item("Potion", player)
+
+
+@benchmark("inventory.sell_item", INVENTORY_SIZES)
+def bench_sell_item(size):
+    player = make_player(size)
+    return lambda: player.inventory.sell_item("Potion")
+
+
+@benchmark("inventory.sort_items", INVENTORY_SIZES)
+def bench_sort_items(size):
+    inventory = make_player(size).inventory
+    entries = list(inventory.stacks.items())
+    random.Random(0).shuffle(entries)
+    shuffled = dict(entries)  # sort_items() builds a new dict, so this one can be reused
+
+    def sort():
+        inventory.stacks = shuffled
+        inventory.sort_items()
+    return sort
+
+
+# Shop
+
+@benchmark("shop.buy_sell_bulk")
+def bench_shop_bulk(size):
+    player = make_player()
+    shop = Shop()
+    order = [("Potion", 20), ("Shield", 2)]
+
+    def trade():
+        player.inventory.gold = 10**9
+        shop.buy(player, order)
+        shop.sell(player, order)  # Puts the stock back for the next call
+    return trade
+
+
+# Saves
+
+@benchmark("save_load_round_trip", (10, 1_000))
+def bench_save_load(size):
+    player = make_player(size)
+    player.name = f"Bench{size}"
+
+    def round_trip():
+        player.hp -= 1  # Something to save each time
+        game.save_game(player)
+        game.load_game(player.name)
+    return round_trip
+
+
+@benchmark("snapshot_decode", ("json", "binary"))
+def bench_snapshot_decode(fmt):
+    state = game.player_to_save_data(make_player(10))
+    if fmt == "binary":
+        data = save_codec.encode(state)
+        return lambda: save_codec.decode(data)
+    text = json.dumps(state, indent=4)
+    return lambda: json.loads(text)
+
+
+@benchmark("snapshot_summary.binary")
+def bench_snapshot_summary(size):
+    # What listing saves decodes from a binary snapshot: everything but the inventory
+    data = save_codec.encode(game.player_to_save_data(make_player(10)))
+    return lambda: save_codec.SaveView(data).summary(SUMMARY_FIELDS)
+
+
+# World
+
+@benchmark("location.apply_effect")
+def bench_apply_effect(size):
+    player = make_player()
+    forest = locations["Winter Forest"]
+
+    def apply():
+        forest.apply_effect(player)
+        forest.remove_effect(player)
+    return apply
+
+
+@benchmark("check_win_condition", (3, 1_000, 100_000))
+def bench_check_win_condition(size):
+    # Every enemy defeated: the case where the old full scan had to look at all of them
+    world = World(EnemyPool())
+    names = ("Dark Cave", "Winter Forest", "Desert")
+    for i in range(size):
+        world.spawn(GOBLIN, names[i % len(names)]).take_damage(GOBLIN.hp)
+    return lambda: game.check_win_condition(world)
+
+
+def time_operation(operation, repeat=5):
+    """Best time per call in seconds, over `repeat` runs of at least 0.2 s each."""
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(name_filter=None, repeat=5):
+    """Run the (matching) benchmarks and return {key: nanoseconds per call}."""
+    results = {}
+    saved_dir = game.SAVE_DIR
+    with tempfile.TemporaryDirectory() as save_dir, use_bus(EventBus()):  # Events are not rendered
+        game.SAVE_DIR = save_dir
+        game._journals.clear()
+        try:
+            for name, size, setup in BENCHMARKS:
+                if name_filter and name_filter not in name:
+                    continue
+                try:
+                    operation = setup(size)
+                except ImportError as e:  # An optional dependency (NumPy for hordes) is missing
+                    print(f"Skipping {key(name, size)}: {e}", file=sys.stderr)
+                    continue
+                results[key(name, size)] = time_operation(operation, repeat) * 1e9
+        finally:
+            game.SAVE_DIR = saved_dir
+            game._journals.clear()
+    return results
+
+
+def environment():
+    """Where a baseline is recorded. The host is informational: CI runners change it on every run."""
+    return {"host": platform.node(), "machine": platform.machine(), "python": platform.python_version()}
+
+
+def _python_series(version):
+    return ".".join(str(version).split(".")[:2])  # "3.11.7" -> "3.11"; patch releases time alike
+
+
+def foreign(baseline):
+    """Why `baseline` was not recorded on this kind of machine and Python, or None if it was."""
+    here = environment()
+    if baseline.get("machine") != here["machine"]:
+        return f"recorded on machine {baseline.get('machine')!r}, not {here['machine']!r}"
+    if _python_series(baseline.get("python")) != _python_series(here["python"]):
+        return f"recorded with Python {baseline.get('python')!r}, not {here['python']!r}"
+    return None
+
+
+def load_baseline(path=BASELINE_FILE):
+    """The stored baseline: environment() fields plus "results", or None if there is none."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    baseline = {
+        **environment(),
+        "results": {name: round(ns, 1) for name, ns in results.items()},
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Print the comparison report and return the names of benchmarks that regressed."""
+    regressions = []
+    print(f"{'Benchmark':<36} {'Baseline ns':>12} {'Current ns':>12} {'Change':>8}")
+    for name, ns in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>12} {ns:>12.1f} {'new':>8}")
+            continue
+        change = ns / base - 1
+        status = ""
+        if change > threshold:
+            status = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<36} {base:>12.1f} {ns:>12.1f} {change:>+8.0%}{status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the game's hot paths and compare with the baseline.")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per benchmark (the best one counts)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--allow-foreign", action="store_true",
+                        help="Compare with a baseline recorded on another machine type or Python version")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    mismatch = foreign(baseline) if baseline else None
+    if mismatch and not (args.update_baseline or args.allow_foreign):
+        parser.exit(2, f"The baseline in {args.baseline} was {mismatch}. Record one on this machine with "
+                       "--update-baseline, or pass --allow-foreign to compare with it anyway.\n")
+
+    results = run(args.filter, args.repeat)
+    if args.update_baseline:
+        # A filtered run only replaces its own entries, unless the old ones come from elsewhere
+        kept = dict(baseline["results"]) if baseline and not mismatch else {}
+        kept.update(results)
+        save_baseline(kept, args.baseline)
+        compare(results, {})
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if baseline is None:
+        compare(results, {})
+        print(f"\nNo baseline at {args.baseline} to check against; record one with --update-baseline.")
+        return
+    if mismatch:
+        print(f"Comparing with a baseline {mismatch} (--allow-foreign).\n")
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        sys.exit(1)
+    print("\nNo regressions.")
+
+if __name__ == "__main__":
+    main()
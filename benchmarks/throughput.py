@@ -0,0 +1,156 @@
+# benchmarks/throughput.py
+
+"""
+Throughput benchmark for the interactive command loop.
+
+Plays canned scenario scripts (benchmarks/scenarios/*.txt, one input line per line) through
+game.play() with no terminal attached, and reports commands per second plus latency
+percentiles for each main-menu command. Combat prompts are answered with a basic attack,
+so scripts only list menu input. Saves go to a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.throughput --repeat 200
+    python -m benchmarks.throughput benchmarks/scenarios/shopping.txt --echo
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+import game
+from combat import ACTION_PROMPT, ATTACK
+from events import EventBus, TerminalSink, use_bus
+from gameio import ScriptedIO, ScriptExhausted
+from rng import rng_service
+
+SCENARIO_DIR = os.path.join(os.path.dirname(__file__), "scenarios")
+INVALID = "(invalid)"  # Label for input the main menu does not recognise
+
+
+def load_scenario(path):
+    """Input lines of a scenario script, skipping blank lines and # comments."""
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip() and not line.startswith("#")]
+
+
+class TimedIO(ScriptedIO):
+    """ScriptedIO that times each main-menu command, from its input to the next menu prompt."""
+    def __init__(self, lines, samples, echo=False):
+        super().__init__(lines, auto={ACTION_PROMPT: ATTACK}, echo=echo)
+        self.samples = samples  # Command -> list of latencies in seconds
+        self.command = None
+        self.started = 0.0
+
+    async def ask(self, prompt):
+        menu = prompt == game.MENU_PROMPT
+        if menu:
+            self.finish()
+        answer = await super().ask(prompt)
+        if menu:
+            command = answer.lower()
+            self.command = command if command in game.COMMANDS else INVALID
+            self.started = time.perf_counter()
+        return answer
+
+    def finish(self):
+        """Close the timing of the command in progress, if any."""
+        if self.command is not None:
+            self.samples[self.command].append(time.perf_counter() - self.started)
+            self.command = None
+
+
+async def play_scenario(lines, repeat, samples, seed, echo=False):
+    """Play a script `repeat` times. Returns the number of main-menu commands run."""
+    for _ in range(repeat):
+        rng_service.reseed(seed)  # Every repetition plays out the same fights
+        io = TimedIO(lines, samples, echo)
+        try:
+            await game.play(io)
+        except ScriptExhausted:
+            pass  # The script ended before the game did
+        io.finish()
+    return sum(len(latencies) for latencies in samples.values())
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run(paths, repeat=100, seed=0, echo=False, autosave=False):
+    """
+    Play each scenario and return a report dict: commands per second for each scenario and
+    latency percentiles (in microseconds) for each command across all of them.
+    """
+    bus = EventBus([TerminalSink()]) if echo else EventBus()  # No sinks: events cost a lookup
+    all_samples = defaultdict(list)
+    scenarios = {}
+    saved = game.SAVE_DIR, game.AUTOSAVE
+    with tempfile.TemporaryDirectory() as save_dir, use_bus(bus):
+        game.SAVE_DIR, game.AUTOSAVE = save_dir, autosave
+        game._journals.clear()
+        try:
+            for path in paths:
+                lines = load_scenario(path)
+                samples = defaultdict(list)
+                start = time.perf_counter()
+                commands = asyncio.run(play_scenario(lines, repeat, samples, seed, echo))
+                elapsed = time.perf_counter() - start
+                scenarios[os.path.basename(path)] = {
+                    "commands": commands,
+                    "seconds": elapsed,
+                    "commands_per_second": commands / elapsed if elapsed else 0.0,
+                }
+                for command, latencies in samples.items():
+                    all_samples[command].extend(latencies)
+        finally:
+            game.SAVE_DIR, game.AUTOSAVE = saved
+            game._journals.clear()
+
+    latency = {}
+    for command, latencies in sorted(all_samples.items()):
+        latencies.sort()
+        latency[command] = {
+            "count": len(latencies),
+            "p50_us": percentile(latencies, 0.50) * 1e6,
+            "p90_us": percentile(latencies, 0.90) * 1e6,
+            "p99_us": percentile(latencies, 0.99) * 1e6,
+            "max_us": latencies[-1] * 1e6,
+        }
+    return {"repeat": repeat, "seed": seed, "autosave": autosave, "scenarios": scenarios, "latency": latency}
+
+
+def print_report(report):
+    print(f"{'Scenario':<20} {'Commands':>9} {'Seconds':>8} {'Commands/s':>11}")
+    for name, result in report["scenarios"].items():
+        print(f"{name:<20} {result['commands']:>9} {result['seconds']:>8.2f} {result['commands_per_second']:>11.0f}")
+    print(f"\n{'Command':<16} {'Count':>8} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} {'max us':>9}")
+    for command, stats in report["latency"].items():
+        print(f"{command:<16} {stats['count']:>8} {stats['p50_us']:>9.1f} {stats['p90_us']:>9.1f} "
+              f"{stats['p99_us']:>9.1f} {stats['max_us']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure command-loop throughput with scripted input.")
+    parser.add_argument("scenarios", nargs="*", help="Scenario scripts (default: all in benchmarks/scenarios)")
+    parser.add_argument("--repeat", type=int, default=100, help="Times to play each scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--autosave", action="store_true", help="Save after every turn, like ADVENTURE_AUTOSAVE")
+    parser.add_argument("--echo", action="store_true", help="Show the game's output (slow; for checking scripts)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    paths = args.scenarios or sorted(glob.glob(os.path.join(SCENARIO_DIR, "*.txt")))
+    report = run(paths, args.repeat, args.seed, args.echo, args.autosave)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# catalog.py
+
+"""
+Central item catalog. Every item in the game is defined once, in content/items.json, and
+shared by id; shops, enemy drops, inventories and saves all refer to these instances.
+The catalog is built the first time it is used.
+"""
+
+import content
+from inventory import Item
+
+def _build():
+    """Create the catalog items: ITEMS (item id -> Item) plus a case-folded name index."""
+    items = [Item(entry["name"], entry["description"], entry["type"], price=entry.get("price", 0),
+                  attack_bonus=entry.get("attack_bonus", 0), defense_bonus=entry.get("defense_bonus", 0))
+             for entry in content.load("items")]
+    return {
+        "ITEMS": {item.item_id: item for item in items},
+        "_items_by_name": {item.name.casefold(): item for item in items},
+    }
+
+
+_content = content.LazyContent(__name__, _build, ("ITEMS", "_items_by_name"))
+__getattr__ = _content.getattr
+
+
+def get_items():
+    """The catalog: item id -> Item."""
+    return _content.get("ITEMS")
+
+
+def get_item(item_id):
+    """Return the catalog item with this id. Raises KeyError for unknown ids."""
+    return get_items()[item_id]
+
+
+def find_item(name):
+    """Return the catalog item with this name (case-insensitive), or None."""
+    return _content.get("_items_by_name").get(name.casefold())
+
+
+def is_catalog_item(item):
+    return get_items().get(item.item_id) is item
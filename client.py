@@ -0,0 +1,65 @@
+# client.py
+
+"""
+Minimal terminal client for server.py: shows everything the server sends and forwards
+each line typed on stdin.
+
+    python client.py --host 127.0.0.1 --port 4000
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+
+
+async def pump_output(reader):
+    while True:
+        data = await reader.read(4096)
+        if not data:
+            return
+        sys.stdout.write(data.decode(errors="replace"))
+        sys.stdout.flush()
+
+
+def read_stdin(loop, queue):
+    """Runs in a daemon thread so a pending read never keeps the client alive."""
+    for line in sys.stdin:
+        loop.call_soon_threadsafe(queue.put_nowait, line)
+    loop.call_soon_threadsafe(queue.put_nowait, None)
+
+
+async def pump_input(writer):
+    queue = asyncio.Queue()
+    threading.Thread(target=read_stdin, args=(asyncio.get_running_loop(), queue), daemon=True).start()
+    while True:
+        line = await queue.get()
+        if line is None:
+            return
+        writer.write(line.encode())
+        await writer.drain()
+
+
+async def run(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    output = asyncio.create_task(pump_output(reader))
+    user_input = asyncio.create_task(pump_input(writer))
+    # The session is over once the server closes the connection
+    await output
+    user_input.cancel()
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect to an adventure game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.host, args.port))
+    except (ConnectionError, KeyboardInterrupt):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,184 @@
 # combat.py
-from random import choice
+import profiling
+from events import EventBus, use_bus
+from rng import rng_service
+from stats import ENCOUNTER, STANCE, Modifier
 
-def combat(player, location_enemies):
-    """Simulate combat against all enemies in a specific location."""
-    print(f"A hostile creature from the {player.current_location.name} approaches!")
+# Action codes shared by the combat menu and headless policies
+ATTACK = "1"
+POWER_ATTACK = "2"
+DEFEND = "3"
+USE_ITEM = "4"
+
+ACTION_PROMPT = "Choose an action: [1] Attack [2] Power Attack [3] Defend [4] Use Item: "
+
+# How combat turns are labelled in profiling reports
+TURN_LABELS = {
+    ATTACK: "combat turn: attack",
+    POWER_ATTACK: "combat turn: power attack",
+    DEFEND: "combat turn: defend",
+    USE_ITEM: "combat turn: use item",
+}
+
+
+def _quiet(text=""):
+    pass
+
+
+def resolve_turn(player, enemy, action, item_name=None, rng=None, say=_quiet):
+    """
+    Play one turn by the game's rules: the player's action, then the enemy's attack if it is
+    still alive. combat() and simulate_fight() both go through here, so they cannot drift apart.
+    `say` gets the combat messages that are not events; `rng` defaults to the player's stream.
+    """
+    if action == ATTACK:  # Basic attack
+        player.attack_enemy(enemy, rng)
+
+    elif action == POWER_ATTACK:  # Power attack with higher risk
+        damage = player.attack * 1.5
+        actual_damage = max(1, damage - enemy.defense)
+        enemy.take_damage(actual_damage)  # Keeps the world's live-enemy count in step
+        say(f"{player.name} performs a Power Attack on {enemy.name} for {actual_damage} damage!")
+        # Player loses some defense on next enemy turn
+        player.stats.add_modifier(Modifier("stance", STANCE, "defense", add=-2))
+        say(f"{player.name} feels more vulnerable after the Power Attack.")
+
+    elif action == DEFEND:  # Defend to boost defense temporarily
+        player.stats.add_modifier(Modifier("stance", STANCE, "defense", add=5))
+        say(f"{player.name} takes a defensive stance, raising defense by 5.")
+
+    elif action == USE_ITEM:  # Use item
+        player.inventory.use_item(item_name, player)
+
+    # Enemy's turn to attack if it's still alive
+    if enemy.is_alive():
+        enemy.attack_player(player)
+
+    # Reset defense modifications after each turn
+    player.stats.remove_modifier("stance", "defense")
+
+
+async def combat(player, location_enemies, io):
+    """Simulate combat against all enemies in a specific location, reading actions from `io`."""
+    io.say(f"A hostile creature from the {player.current_location.name} approaches!")
+    encounter_rng = rng_service.stream()  # Independent stream for this encounter's loot
+    profiler = profiling.active  # None unless profiling mode is on
 
     # Loop through each enemy in the location until either player or enemies are all defeated
     for enemy in location_enemies:
         if not enemy.is_alive():
             continue  # Skip already defeated enemies
 
-        print(f"\nYou encounter a {enemy.name}!")
+        io.say(f"\nYou encounter a {enemy.name}!")
         while player.hp > 0 and enemy.hp > 0:
-            print(f"\n{player.name} HP: {player.hp} | {enemy.name} HP: {enemy.hp}")
-            action = input("Choose an action: [1] Attack [2] Power Attack [3] Defend [4] Use Item: ")
-
-            if action == "1":  # Basic attack
-                print()  # Extra space
-                player.attack_enemy(enemy)
-
-            elif action == "2":  # Power attack with higher risk
-                print()  # Extra space
-                damage = player.attack * 1.5
-                actual_damage = max(1, damage - enemy.defense)
-                enemy.hp -= actual_damage
-                print(f"{player.name} performs a Power Attack on {enemy.name} for {actual_damage} damage!")
-                # Player loses some defense on next enemy turn
-                player.defense -= 2
-                print(f"{player.name} feels more vulnerable after the Power Attack.")
-
-            elif action == "3":  # Defend to boost defense temporarily
-                print()  # Extra space
-                player.defense += 5
-                print(f"{player.name} takes a defensive stance, raising defense by 5.")
-
-            elif action == "4":  # Use item
-                print()  # Extra space
-                item_name = input("Enter item name to use: ")
-                player.inventory.use_item(item_name, player)
-
-            else:
-                print()  # Extra space
-                print("Invalid action. Please choose a number between 1 and 4.")
-
-            # Enemy's turn to attack if it's still alive
-            if enemy.is_alive():
-                enemy.attack_player(player)
-
-            # Reset defense modifications after each turn
-            if action == "3":
-                player.defense -= 5
-            elif action == "2":
-                player.defense += 2
+            io.say(f"\n{player.name} HP: {player.hp} | {enemy.name} HP: {enemy.hp}")
+            action = await io.ask(ACTION_PROMPT)
+            if profiler:
+                turn_started = profiler.clock(io)
+            io.say()  # Extra space
+
+            item_name = None
+            if action == USE_ITEM:
+                item_name = await io.ask("Enter item name to use: ")
+            elif action not in (ATTACK, POWER_ATTACK, DEFEND):
+                io.say("Invalid action. Please choose a number between 1 and 4.")  # The enemy still attacks
+            resolve_turn(player, enemy, action, item_name, say=io.say)
+
+            if profiler:
+                profiler.record(TURN_LABELS.get(action, "combat turn: invalid"), profiler.clock(io) - turn_started)
 
         # Check if the enemy has been defeated
         if player.hp > 0 and not enemy.is_alive():
-            print(f"{enemy.name} has been defeated!")
+            io.say(f"{enemy.name} has been defeated!")
             xp_reward = enemy.exp_reward()
-            print(f"{player.name} gains {xp_reward} experience points!")
+            io.say(f"{player.name} gains {xp_reward} experience points!")
             player.gain_experience(xp_reward)  # Add XP reward to player
 
             # Check for item drops
-            item_drop = enemy.drop_item()
+            item_drop = enemy.drop_item(encounter_rng)
             if item_drop:
                 player.inventory.add_item(item_drop)
-                print(f"{player.name} has acquired {item_drop.name} from {enemy.name}!")
+                io.say(f"{player.name} has acquired {item_drop.name} from {enemy.name}!")
 
         # Check if the player is defeated
         if player.hp <= 0:
-            print("You have been defeated...")
+            io.say("You have been defeated...")
             break
 
+    player.stats.remove_layer(ENCOUNTER)  # Skill buffs last for one encounter
+
     # Final message if the player survives the encounter
     if player.hp > 0:
-        print("All enemies in this location have been defeated!")
+        io.say("All enemies in this location have been defeated!")
+
+
+# Headless combat engine
+# The functions below play turns through resolve_turn() like combat(), but never touch stdin
+# or stdout, so fights can be run in bulk by simulations and bots.
+
+class FightResult:
+    def __init__(self, won, turns, player_hp, enemy_hp):
+        self.won = won  # True if the player survived and the enemy was defeated
+        self.turns = turns
+        self.player_hp = player_hp
+        self.enemy_hp = enemy_hp
+
+    def __repr__(self):
+        return (f"FightResult(won={self.won}, turns={self.turns}, "
+                f"player_hp={self.player_hp}, enemy_hp={self.enemy_hp})")
+
+
+def always_attack(player, enemy):
+    """Policy: use a basic attack every turn."""
+    return ATTACK
+
+
+def always_power_attack(player, enemy):
+    """Policy: use a power attack every turn."""
+    return POWER_ATTACK
+
+
+def heal_when_low(player, enemy):
+    """Policy: drink a healing item below 30% HP, otherwise attack."""
+    if player.hp < player.max_hp * 0.3:
+        for stack in player.inventory.stacks.values():
+            if stack.item.item_type == "heal":
+                return USE_ITEM, stack.item.name
+    return ATTACK
+
+
+def optimal_play(player, enemy):
+    """Policy: the action with the best odds of winning, from the combat solver."""
+    from combat_solver import optimal_action  # Imported on first use; combat_solver builds on this module
+    return optimal_action(player, enemy)
+
+
+# Policies by name, so batch runners can pass them between processes
+POLICIES = {
+    "attack": always_attack,
+    "power": always_power_attack,
+    "heal": heal_when_low,
+    "optimal": optimal_play,
+}
+
+
+_SILENT = EventBus()  # No sinks, so simulated fights never format any text
+
+
+def simulate_fight(player, enemy, policy=always_attack, rng=None):
+    """
+    Fight a single enemy to the end without any terminal I/O.
+    `policy(player, enemy)` returns an action code, or (USE_ITEM, item_name) to use an item.
+    `rng` defaults to the player's own stream; anything with randint() and random() works.
+    """
+    turns = 0
+    with use_bus(_SILENT):
+        while player.hp > 0 and enemy.hp > 0:
+            turns += 1
+            action = policy(player, enemy)
+            item_name = None
+            if isinstance(action, tuple):
+                action, item_name = action
+            resolve_turn(player, enemy, action, item_name, rng)
+
+    return FightResult(player.hp > 0 and enemy.hp <= 0, turns, player.hp, enemy.hp)
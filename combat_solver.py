@@ -0,0 +1,237 @@
+# combat_solver.py
+
+"""
+Optimal-play combat solver.
+
+Works out, for every state of a one-on-one fight, the action with the best chance of
+winning, using the same rules as simulate_fight(). A fight's state is (player HP, enemy HP,
+healing items left); stances last a single turn, so defense changes are part of each action
+rather than of the state. Each state is solved once by expectimax over the attack roll and
+the result kept in a transposition table, so a whole fight, or many fights against the same
+enemy, costs one search.
+
+Outcomes are ranked by win probability, then by what the player has left afterwards (HP,
+plus HEAL_AMOUNT for each unused healing item, so potions are not drunk for nothing), then
+by the fewest turns.
+
+Memory is bounded by one budget of MAX_ENTRIES states shared by every solver that
+solver_for() keeps. Before each search, the least recently used solvers are dropped until
+the tables fit the budget, and if the current solver's table alone is over it, that table is
+cleared. So when a search starts, all tables together hold at most MAX_ENTRIES states. The
+search itself adds at most one entry per reachable state: player HP x enemy HP x
+(POTION_CAP + 1) for the autopilot, e.g. 120 x 45 x 11 = 59,400 for a level 1 Warrior
+against a Snow Wolf.
+
+    python combat_solver.py --level 1 --potions 2
+"""
+
+import argparse
+from collections import OrderedDict
+
+from combat import ATTACK, DEFEND, POWER_ATTACK, USE_ITEM
+from enemy import enemy_templates
+from simulate import CHARACTER_CLASSES, build_character
+
+HEAL_AMOUNT = 20  # HP restored by a healing item, as in Inventory.use_item
+CRITICAL_CHANCE = 0.2
+ATTACK_SPREAD = range(-3, 4)  # Attack damage varies by randint(-3, 3)
+MAX_ENTRIES = 500_000  # States kept across all of solver_for()'s solvers (or by one standalone solver)
+MAX_SOLVERS = 64  # Matchups kept by solver_for()
+POTION_CAP = 10  # Healing items the autopilot plans with; more multiply the search for little gain
+
+_TIE = 1e-12  # Win probabilities closer than this count as equal
+
+
+class Outcome:
+    def __init__(self, action, win_probability, expected_hp, expected_potions, expected_turns):
+        self.action = action  # Best action code in the queried state
+        self.win_probability = win_probability
+        self.expected_hp = expected_hp  # Player HP left at the end, counting a loss as 0
+        self.expected_potions = expected_potions  # Healing items left at the end, counting a loss as 0
+        self.expected_turns = expected_turns
+
+    def __repr__(self):
+        return (f"Outcome(action={self.action}, win_probability={self.win_probability:.4f}, "
+                f"expected_hp={self.expected_hp:.2f}, expected_potions={self.expected_potions:.2f}, "
+                f"expected_turns={self.expected_turns:.2f})")
+
+
+class CombatSolver:
+    """Solves fights between one player build and one enemy build, from any state."""
+    def __init__(self, attack, defense, max_hp, enemy_attack, enemy_defense, max_entries=MAX_ENTRIES):
+        self.max_hp = max_hp
+        self.max_entries = max_entries
+        self.table = {}  # (player hp, enemy hp, potions) -> (action, win probability, hp, potions, turns)
+
+        # Damage dealt by a basic attack: (probability, damage) for every distinct roll
+        rolls = {}
+        for spread in ATTACK_SPREAD:
+            damage = attack + spread
+            rolls[damage] = rolls.get(damage, 0.0) + (1 - CRITICAL_CHANCE) / len(ATTACK_SPREAD)
+            rolls[damage * 2] = rolls.get(damage * 2, 0.0) + CRITICAL_CHANCE / len(ATTACK_SPREAD)
+        self.attack_rolls = tuple(rolls.items())
+        self.power_damage = max(1, attack * 1.5 - enemy_defense)
+
+        # Damage the enemy deals back after each action, with that turn's stance
+        self.hit = max(1, enemy_attack - defense)
+        self.hit_after_power = max(1, enemy_attack - (defense - 2))
+        self.hit_defending = max(1, enemy_attack - (defense + 5))
+
+    def _branches(self, php, ehp, potions):
+        """
+        For every action in this state: (action, [(probability, next state or None, win, hp, potions)]).
+        A next state of None means the fight ended, with the given win flag, HP and potions left.
+        """
+        exchange = self._exchange
+        branches = [
+            (ATTACK, [exchange(probability, php, max(ehp - damage, 0), potions, self.hit)
+                      for damage, probability in self.attack_rolls]),
+            (POWER_ATTACK, [exchange(1.0, php, ehp - self.power_damage, potions, self.hit_after_power)]),
+            (DEFEND, [exchange(1.0, php, ehp, potions, self.hit_defending)]),
+        ]
+        if potions:
+            healed = min(self.max_hp, php + HEAL_AMOUNT)
+            branches.append((USE_ITEM, [exchange(1.0, healed, ehp, potions - 1, self.hit)]))
+        return branches
+
+    @staticmethod
+    def _exchange(probability, php, ehp, potions, hit):
+        """The player has acted, leaving the enemy at `ehp`; the enemy strikes back if it can."""
+        if ehp <= 0:
+            return probability, None, 1.0, php, potions
+        php -= hit
+        if php <= 0:
+            return probability, None, 0.0, 0, 0
+        return probability, (php, ehp, potions), 0.0, 0, 0
+
+    def _solve(self, root):
+        """Fill the table for `root` and every state reachable from it, deepest states first."""
+        table = self.table
+        expanded = {}  # State -> its branches, kept while its children are being solved
+        stack = [root]
+        while stack:
+            state = stack[-1]
+            if state in table:
+                stack.pop()
+                continue
+            branches = expanded.get(state)
+            if branches is None:
+                branches = expanded[state] = self._branches(*state)
+                unsolved = {child for _, results in branches for _, child, _, _, _ in results
+                            if child is not None and child not in table}
+                if unsolved:
+                    stack.extend(unsolved)  # Solve the children, then come back to this state
+                    continue
+            del expanded[state]
+
+            best = best_rank = None
+            for action, results in branches:
+                win = hp = potions = turns = 0.0
+                for probability, child, end_win, end_hp, end_potions in results:
+                    if child is None:
+                        win += probability * end_win
+                        hp += probability * end_hp
+                        potions += probability * end_potions
+                        turns += probability
+                    else:
+                        _, child_win, child_hp, child_potions, child_turns = table[child]
+                        win += probability * child_win
+                        hp += probability * child_hp
+                        potions += probability * child_potions
+                        turns += probability * (1 + child_turns)
+                rank = (hp + HEAL_AMOUNT * potions, -turns)
+                if best is None or win > best[1] + _TIE or (win > best[1] - _TIE and rank > best_rank):
+                    best, best_rank = (action, win, hp, potions, turns), rank
+            table[state] = best
+            stack.pop()
+
+    def solve(self, php, ehp, potions=0):
+        """The optimal action and expected outcome from this state."""
+        state = (php, ehp, potions)
+        entry = self.table.get(state)
+        if entry is None:
+            if len(self.table) >= self.max_entries:
+                self.table.clear()
+            self._solve(state)
+            entry = self.table[state]
+        return Outcome(*entry)
+
+
+_solvers = OrderedDict()  # (attack, defense, max_hp, enemy attack, enemy defense) -> CombatSolver, oldest use first
+
+
+def _trim(keep):
+    """Drop least recently used solvers, never `keep`, until they fit MAX_SOLVERS and the shared MAX_ENTRIES."""
+    total = sum(len(solver.table) for solver in _solvers.values())
+    while len(_solvers) > MAX_SOLVERS or total > MAX_ENTRIES:
+        matchup, solver = next(iter(_solvers.items()))
+        if solver is keep:
+            break  # Only the current solver is left
+        del _solvers[matchup]
+        total -= len(solver.table)
+    if total > MAX_ENTRIES:
+        keep.table.clear()
+
+
+def solver_for(player, enemy):
+    """The solver for this player and enemy's current stats, shared by every fight between such builds."""
+    matchup = (player.attack, player.defense, player.max_hp, enemy.attack, enemy.defense)
+    solver = _solvers.get(matchup)
+    if solver is None:
+        solver = _solvers[matchup] = CombatSolver(*matchup)
+    else:
+        _solvers.move_to_end(matchup)  # Now the most recently used
+    return solver
+
+
+def _solve(player, enemy, potions):
+    solver = solver_for(player, enemy)
+    if (player.hp, enemy.hp, potions) not in solver.table:
+        _trim(solver)  # A search is coming, so make room for it first
+    return solver.solve(player.hp, enemy.hp, potions)
+
+
+def _healing_items(player):
+    """(number of healing items carried, up to POTION_CAP, and the name of one of them)."""
+    count, name = 0, None
+    for stack in player.inventory.stacks.values():
+        if stack.item.item_type == "heal":
+            count += stack.quantity
+            name = name or stack.item.name
+    return min(count, POTION_CAP), name
+
+
+def expected_outcome(player, enemy):
+    """Win probability, HP left and turns taken if the player plays optimally from here."""
+    potions, _ = _healing_items(player)
+    return _solve(player, enemy, potions)
+
+
+def optimal_action(player, enemy):
+    """Policy: the action with the best odds. Returns (USE_ITEM, item name) to drink a potion."""
+    potions, item_name = _healing_items(player)
+    action = _solve(player, enemy, potions).action
+    return (USE_ITEM, item_name) if action == USE_ITEM else action
+
+
+ACTION_NAMES = {ATTACK: "attack", POWER_ATTACK: "power attack", DEFEND: "defend", USE_ITEM: "use item"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Win odds for every class and enemy under optimal play.")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--potions", type=int, default=0, help="Healing potions carried into each fight")
+    args = parser.parse_args()
+
+    print(f"{'Class':<10} {'Enemy':<14} {'Win':>8} {'HP left':>8} {'Potions':>8} {'Turns':>6}  First move")
+    for char_class in CHARACTER_CLASSES:
+        player = build_character(char_class, args.level, args.potions)
+        for template in enemy_templates.values():
+            outcome = expected_outcome(player, template)
+            print(f"{char_class:<10} {template.name:<14} {outcome.win_probability:>8.2%} "
+                  f"{outcome.expected_hp:>8.1f} {outcome.expected_potions:>8.2f} {outcome.expected_turns:>6.2f}  "
+                  f"{ACTION_NAMES[outcome.action]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# content.py
+
+"""
+Game content (items, enemies, locations, shop stock) loaded from the JSON files in content/.
+
+Each file is read the first time something asks for it. The parsed data is cached next to
+it in content/__cache__/ as a marshal file named after a hash of the JSON, so later runs
+skip JSON parsing, and editing a file simply produces a new cache entry. The modules that
+build objects from this data (catalog, enemy, location, skills) do so on first access too,
+through LazyContent, so importing the game does not construct any content.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+CACHE_DIR = os.path.join(CONTENT_DIR, "__cache__")
+
+_loaded = {}  # Content name -> parsed data, for this process
+
+
+def load(name):
+    """Return the parsed data of content/<name>.json."""
+    data = _loaded.get(name)
+    if data is None:
+        data = _loaded[name] = _load_file(name)
+    return data
+
+
+class LazyContent:
+    """
+    Module attributes built from content the first time one of them is needed:
+
+        _content = content.LazyContent(__name__, _build, ("SKILLS",))
+        __getattr__ = _content.getattr
+
+    `build()` returns a dict of values; only the fixed `names` are published on the module,
+    so a content entry can never replace anything else defined there. Code inside the module
+    reads them with _content.get(name), which builds them if needed.
+    """
+    def __init__(self, module_name, build, names):
+        self.module = sys.modules[module_name]
+        self.build = build
+        self.names = frozenset(names)
+        self.values = None  # Name -> value once built
+
+    def load(self):
+        values = self.values
+        if values is None:
+            built = self.build()
+            values = self.values = {name: built[name] for name in self.names if name in built}
+            vars(self.module).update(values)  # Later lookups are ordinary attribute reads
+        return values
+
+    def get(self, name):
+        return self.load()[name]
+
+    def getattr(self, name):
+        """The module's __getattr__: only reached for names that are not module attributes yet."""
+        if name in self.names:
+            values = self.load()
+            if name in values:
+                return values[name]
+        raise AttributeError(f"module {self.module.__name__!r} has no attribute {name!r}")
+
+
+def _cache_path(name, raw):
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{name}.{digest}.{marshal.version}.marshal")
+
+
+def _load_file(name):
+    with open(os.path.join(CONTENT_DIR, f"{name}.json"), "rb") as f:
+        raw = f.read()
+    cache_path = _cache_path(name, raw)
+    try:
+        with open(cache_path, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Not compiled yet, or unreadable: parse the JSON and compile it
+
+    data = json.loads(raw)
+    _write_cache(name, cache_path, data)
+    return data
+
+
+def _write_cache(name, cache_path, data):
+    """Store the compiled form and drop stale entries for the same file. Failures are ignored."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, cache_path)  # Concurrent workers never see a partial file
+        for entry in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, entry)
+            if entry.startswith(f"{name}.") and entry.endswith(".marshal") and path != cache_path:
+                os.remove(path)
+    except OSError:
+        pass  # E.g. a read-only install; the JSON is simply parsed on every run
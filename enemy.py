@@ -1,34 +1,87 @@
 # enemy.py
-from inventory import Item
-from random import choice
+import content
+from catalog import get_item
+from events import emit
+from rng import rng_service
+
+
+
+class EnemyTemplate:
+    """Immutable stat block that live enemies are spawned from."""
+    __slots__ = ("name", "hp", "attack", "defense", "location", "drop_items")
+
+    def __init__(self, name, hp, attack, defense, location, drop_items=()):
+        fields = {
+            "name": name,
+            "hp": hp,
+            "attack": attack,
+            "defense": defense,
+            "location": location,
+            "drop_items": tuple(drop_items),  # Shared by every enemy spawned from this template
+        }
+        for field, value in fields.items():
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError(f"EnemyTemplate is immutable; cannot set '{field}'")
+
+    def __repr__(self):
+        return f"EnemyTemplate({self.name}, HP: {self.hp}, Attack: {self.attack}, Defense: {self.defense})"
+
 
 class Enemy:
-    def __init__(self, name, hp, attack, defense, location, drop_items=None):
+    __slots__ = ("name", "hp", "attack", "defense", "location", "drop_items", "template", "world")
+
+    def __init__(self, name, hp, attack, defense, location, drop_items=None, template=None):
         self.name = name
         self.hp = hp
         self.attack = attack
         self.defense = defense
         self.location = location  # Location where the enemy can be found
         self.drop_items = drop_items or []
+        self.template = template  # EnemyTemplate this enemy was spawned from, if any
+        self.world = None  # World that counts this enemy among its living ones, if any
+
+    @classmethod
+    def from_template(cls, template):
+        return cls(template.name, template.hp, template.attack, template.defense, template.location,
+                   template.drop_items, template)
+
+    def reset(self, template):
+        """Turn this instance into a fresh copy of `template` (used when recycling pooled enemies)."""
+        self.name = template.name
+        self.hp = template.hp
+        self.attack = template.attack
+        self.defense = template.defense
+        self.location = template.location
+        self.drop_items = template.drop_items
+        self.template = template
+        self.world = None
 
     def attack_player(self, player):
         damage = max(1, self.attack - player.defense)
         player.hp -= damage
-        print(f"{self.name} attacks {player.name} for {damage} damage!")
+        emit("enemy_attack", enemy=self.name, target=player.name, damage=damage)
 
     def take_damage(self, damage):
-        """Reduces the enemy's HP by the specified damage amount."""
+        """
+        Reduces the enemy's HP by the specified damage amount. Damage should always go
+        through here, so the enemy's world can update its live counts when it dies.
+        """
+        was_alive = self.hp > 0
         self.hp -= damage
         if self.hp <= 0:
             self.hp = 0
-            print(f"{self.name} has been defeated!")
+            if was_alive and self.world is not None:
+                self.world.enemy_died(self)
+            emit("enemy_defeated", enemy=self.name)
         else:
-            print(f"{self.name} takes {damage} damage. Remaining HP: {self.hp}")
+            emit("enemy_damaged", enemy=self.name, damage=damage, hp=self.hp)
 
-    def drop_item(self):
-        """Randomly select an item from the enemy's drop list if available."""
+    def drop_item(self, rng=None):
+        """Randomly select an item from the enemy's drop list if available, using the encounter's stream."""
         if self.drop_items:
-            return choice(self.drop_items)
+            return (rng or rng_service.shared("enemy-drops")).choice(self.drop_items)  # Fallback follows reseed()
         return None
 
     def is_alive(self):
@@ -44,46 +97,56 @@ class Enemy:
         xp = base_xp + (self.hp * 0.2) + (self.attack * 1.5) + (self.defense * 1.2)
         return int(xp)
 
-# Define specific enemies for each location
-goblin = Enemy(
-    name="Goblin",
-    hp=30,
-    attack=10,
-    defense=2,
-    location="Dark Cave",  # Change to match location name used in the game
-    drop_items=[
-        Item("Torch", "Illuminates dark areas.", "passive"),
-        Item("Small Potion", "Restores 10 HP.", "heal")
-    ]
-)
-
-snow_wolf = Enemy(
-    name="Snow Wolf",
-    hp=45,
-    attack=15,
-    defense=4,
-    location="Winter Forest",
-    drop_items=[
-        Item("Winter Coat", "Protects against cold weather debuffs.", "passive"),
-        Item("Fur Pelt", "Can be sold or traded.", "misc")
-    ]
-)
-
-sand_scorpion = Enemy(
-    name="Sand Scorpion",
-    hp=40,
-    attack=12,
-    defense=3,
-    location="Desert",
-    drop_items=[
-        Item("Sun Hat", "Protects against heat debuffs.", "passive"),
-        Item("Scorpion Venom", "Used for crafting poisons.", "misc")
-    ]
-)
-
-# Enemy registry for easier access
-enemies_by_location = {
-    "Dark Cave": [goblin],
-    "Winter Forest": [snow_wolf],
-    "Desert": [sand_scorpion]
-}
+
+class EnemyPool:
+    """
+    Spawns enemies from templates, recycling released instances instead of allocating new ones.
+    Release an enemy once nothing refers to it any more (e.g. when its encounter is over).
+    """
+    def __init__(self):
+        self._free = []
+
+    def spawn(self, template):
+        if self._free:
+            enemy = self._free.pop()
+            enemy.reset(template)
+            return enemy
+        return Enemy.from_template(template)
+
+    def release(self, enemy):
+        self._free.append(enemy)
+
+    def release_all(self, enemies_by_location):
+        """Return every enemy in a spawned world to the pool."""
+        for enemies in enemies_by_location.values():
+            self._free.extend(enemies)
+
+
+enemy_pool = EnemyPool()  # Shared pool; spawning from it reuses released enemies
+
+
+# Module constants for the standard enemies: constant name -> template name in content/enemies.json
+TEMPLATE_CONSTANTS = {"GOBLIN": "Goblin", "SNOW_WOLF": "Snow Wolf", "SAND_SCORPION": "Sand Scorpion"}
+
+
+def _build():
+    """
+    Create the enemy templates from content/enemies.json: the enemy_templates registry
+    (name -> template), templates_by_location, and the TEMPLATE_CONSTANTS that exist.
+    """
+    templates = [EnemyTemplate(entry["name"], entry["hp"], entry["attack"], entry["defense"], entry["location"],
+                               [get_item(item_id) for item_id in entry.get("drops", ())])
+                 for entry in content.load("enemies")]
+    enemy_templates = {template.name: template for template in templates}
+    templates_by_location = {}
+    for template in templates:
+        templates_by_location[template.location] = templates_by_location.get(template.location, ()) + (template,)
+    built = {"enemy_templates": enemy_templates, "templates_by_location": templates_by_location}
+    for constant, template_name in TEMPLATE_CONSTANTS.items():
+        if template_name in enemy_templates:
+            built[constant] = enemy_templates[template_name]
+    return built
+
+
+_content = content.LazyContent(__name__, _build, ("enemy_templates", "templates_by_location", *TEMPLATE_CONSTANTS))
+__getattr__ = _content.getattr
@@ -0,0 +1,207 @@
+# events.py
+
+"""
+Structured game events.
+
+Game code (combat, inventory, shop, locations, saves) emits events, a kind plus a few plain
+fields, instead of printing.
+The event bus passes them to pluggable sinks: the terminal renderer that produces the game's
+usual messages, a null sink, a buffered JSONL writer, and an in-memory counter. Text is only
+formatted when a terminal sink is attached, so batch runs skip that cost entirely.
+
+The active bus lives in a context variable. use_bus() swaps it for the current thread or
+asyncio task, so simulations and separate game sessions can each have their own.
+"""
+
+import json
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# How each event kind is shown on the terminal
+MESSAGES = {
+    # Character
+    "already_defeated": "{target} has already been defeated.",
+    "critical_hit": "Critical hit!",
+    "character_attack": "{attacker} attacks {target} for {damage} damage.",
+    "target_defeated": "{target} has been defeated!",
+    "target_hp": "{target} has {hp} HP remaining.",
+    "level_up": "{name} leveled up to level {level}!\nNew stats - HP: {hp}, Attack: {attack}, Defense: {defense}",
+    "character_defeated": "{name} has been defeated!",
+    "character_damaged": "{name} took {damage} damage, remaining HP: {hp}",
+    "unknown_skill": "{name} doesn't know {skill}.",
+    "skill_damage": "{name} used {skill} on {target}, dealing {damage} damage!",
+    "skill_fire_damage": "{name} cast {skill}, dealing {damage} fire damage to {target}!",
+    "skill_critical_damage": "{name} used {skill}, dealing {damage} critical damage to {target}!",
+    "skill_heal": "{name} used {skill} and healed for {amount} HP.",
+    "skill_area_damage": "{name} used {skill}, hitting {count} enemies for {damage} damage each!",
+    "skill_buff": "{name} used {skill}, raising {stat} by {amount} until the end of the next fight.",
+    "no_skill_targets": "There are no enemies here to use {skill} on.",
+    "unequipped": "Unequipping {item}.",
+    "equipped": "{name} has equipped {item}!",
+    "cannot_equip": "{item} cannot be equipped.",
+
+    # Hordes
+    "horde_hit": "{name} hits {target} at the front of the horde for {damage} damage.",
+    "horde_attack": "{count} enemies attack {target} for {damage} damage in total!",
+    "horde_defeated": "{count} enemies defeated! {name} gains {exp} experience points.",
+
+    # Enemy
+    "enemy_attack": "{enemy} attacks {target} for {damage} damage!",
+    "enemy_defeated": "{enemy} has been defeated!",
+    "enemy_damaged": "{enemy} takes {damage} damage. Remaining HP: {hp}",
+
+    # Inventory
+    "item_added": "{item} added to inventory.",
+    "items_added": "{quantity}x {item} added to inventory.",
+    "item_removed": "{item} removed from inventory.",
+    "item_not_found": "Item not found in inventory.",
+    "not_enough_items": "You only have {held} {item}.",
+    "item_healed": "{name} used {item} and restored HP!",
+    "item_boosted": "{name} used {item}, increasing attack!",
+    "inventory_sorted": "Inventory sorted by item name.",
+    "item_sold": "Sold {item} for {price} gold.",
+    "inventory_gold": "Gold: {gold}",
+    "inventory_empty": "Inventory is empty.",
+
+    # Shop
+    "shop_welcome": "Welcome to the shop! Here are the items for sale:",
+    "item_purchased": "{item} purchased for {price} gold.",
+    "items_purchased": "{quantity}x {item} purchased for {price} gold.",
+    "items_sold": "Sold {quantity}x {item} for {price} gold.",
+    "out_of_stock": "Only {stock} {item} left in stock.",
+    "invalid_order": "Enter items as 'Potion', 'Potion x5' or 'Potion x5, Shield'.",
+    "not_enough_gold": "Not enough gold to purchase this item.",
+    "shop_item_not_found": "Item not found in the shop.",
+
+    # Locations
+    "location_protected": "{item} protects {name} from {location}'s harsh conditions!",
+    "location_debuff": "{name}'s attack power is reduced due to the {location} environment.",
+    "location_buff": "{name} feels more resilient in the {location}.",
+
+    # Saves
+    "game_saved": "Game saved for {name}.",
+    "game_loaded": "Game loaded for {name}.",
+    "save_not_found": "Save file not found.",
+    "save_missing_key": "Error: Missing key in save data - {key}",
+    "unknown_saved_item": "Unknown item '{item_id}' in save data was skipped.",
+    "no_saves": "No saved characters found.",
+    "invalid_name": "Names can use letters, digits, spaces, '_' and '-' (up to 32 characters).",
+    "save_unreadable": "The save for {name} could not be read: {error}",
+
+    # Free-form display lines (item listings, stat sheets)
+    "text": "{text}",
+}
+
+
+class EventBus:
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+
+    def emit(self, kind, fields):
+        for sink in self.sinks:
+            sink.handle(kind, fields)
+
+
+class TerminalSink:
+    """Renders events as the game's text messages."""
+    def __init__(self, write=print):
+        self.write = write
+
+    def handle(self, kind, fields):
+        message = MESSAGES.get(kind)
+        if message is not None:
+            self.write(message.format(**fields))
+
+
+class NullSink:
+    """Discards every event."""
+    def handle(self, kind, fields):
+        pass
+
+
+class JsonlSink:
+    """Writes one JSON object per event to a file, in buffered batches."""
+    def __init__(self, path, buffer_size=1000):
+        self.file = open(path, "a")
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def handle(self, kind, fields):
+        self.buffer.append(json.dumps({"event": kind, **fields}, separators=(",", ":")))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ListSink:
+    """Keeps events in order, e.g. to replay them on another bus later."""
+    def __init__(self):
+        self.events = []
+
+    def handle(self, kind, fields):
+        self.events.append((kind, fields))
+
+    def replay(self, bus):
+        for kind, fields in self.events:
+            bus.emit(kind, fields)
+
+
+class CounterSink:
+    """Counts events by kind and sums their numeric fields (e.g. total damage dealt)."""
+    def __init__(self):
+        self.counts = Counter()  # Event kind -> number of events
+        self.totals = Counter()  # "kind.field" -> sum of that numeric field
+
+    def handle(self, kind, fields):
+        self.counts[kind] += 1
+        for field, value in fields.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.totals[f"{kind}.{field}"] += value
+
+
+default_bus = EventBus([TerminalSink()])  # What an interactive game uses
+_current_bus = ContextVar("event_bus", default=default_bus)
+
+
+def emit(kind, **fields):
+    """Send an event to the active bus. Does nothing beyond a lookup when the bus has no sinks."""
+    bus = _current_bus.get()
+    if bus.sinks:
+        bus.emit(kind, fields)
+
+
+def current_bus():
+    return _current_bus.get()
+
+
+@contextmanager
+def use_bus(bus):
+    """Make `bus` the active event bus inside the `with` block (per thread / asyncio task)."""
+    token = _current_bus.set(bus)
+    try:
+        yield bus
+    finally:
+        _current_bus.reset(token)
@@ -1,274 +1,477 @@
 # game.py
 
-import json
+import argparse
+import asyncio
 import os
+import re
+import enemy
+import journal
+import profiling
 from character import Character
-from enemy import enemies_by_location
 from combat import combat
 from inventory import Item, Inventory  # Ensure Inventory is imported correctly
-from shop import Shop
-from location import locations
+from catalog import get_item, get_items, is_catalog_item
+from shop import Shop, parse_order
+import location
+from save_index import SaveIndex
+from save_db import SaveDatabase
+from save_schema import SAVE_VERSION, upgrade_save_data
+from world import World
+from events import EventBus, ListSink, current_bus, emit, use_bus
+from gameio import ConsoleIO
 
 SAVE_DIR = "saves"
-
-def save_game(player):
-    """Save the player's data to a file."""
-    if not os.path.exists(SAVE_DIR):
-        os.makedirs(SAVE_DIR)
-
-    save_data = {
+AUTOSAVE = os.environ.get("ADVENTURE_AUTOSAVE", "") not in ("", "0")  # Save after every turn
+SAVE_BACKEND = os.environ.get("ADVENTURE_SAVE_BACKEND", "json")  # "json" files or a "sqlite" database
+SAVE_FORMAT = os.environ.get("ADVENTURE_SAVE_FORMAT", "json")  # Snapshot format for file saves: "json" or "binary"
+HORDE_SIZE = int(os.environ.get("ADVENTURE_HORDE_SIZE", "0"))  # Horde met when exploring a cleared area; 0 for none
+NAME_PATTERN = re.compile(r"[A-Za-z0-9 _-]{1,32}")  # Character names are also save file names
+
+_journals = {}  # Character name -> SaveJournal tracking what is already on disk
+_save_index = None  # SaveIndex for SAVE_DIR, built on first listing
+_save_database = None  # SaveDatabase in SAVE_DIR, opened on first use with the sqlite backend
+_disk_executor = None  # Where save, load and listing work runs; None runs it inline
+
+def _save_item_entry(stack):
+    """Catalog items are saved as just a quantity under their id; anything else is saved in full."""
+    if is_catalog_item(stack.item):
+        return stack.quantity
+    item = stack.item
+    return {"name": item.name, "description": item.description, "type": item.item_type,
+            "price": item.price, "quantity": stack.quantity}
+
+def player_to_save_data(player):
+    """Build the save dict for a player."""
+    return {
+        "version": SAVE_VERSION,
         "name": player.name,
         "class": player.char_class,
         "hp": player.hp,
         "max_hp": player.max_hp,
-        "attack": player.attack,
-        "defense": player.defense,
+        "attack": player.stats.persistent("attack"),  # Location and stance effects are re-applied on load
+        "defense": player.stats.persistent("defense"),
         "level": player.level,
         "exp": player.exp,
-        "skills": player.skills,
-        "inventory": [{
-            "name": item.name,
-            "description": item.description,
-            "type": item.item_type  # Ensure that each item has the "type" field
-        } for item in player.inventory.items],
+        "skills": list(player.skills),
+        "inventory": {stack.item.item_id: _save_item_entry(stack) for stack in player.inventory.stacks.values()},
         "gold": player.inventory.gold,
         "location": player.current_location.name if player.current_location else None
     }
 
-    with open(f"{SAVE_DIR}/{player.name}.json", "w") as f:
-        json.dump(save_data, f, indent=4)
-    print(f"Game saved for {player.name}.")
+def player_from_save_data(save_data):
+    """Re-create a player from a save dict. Raises KeyError if a required field is missing."""
+    player = Character(save_data["name"], save_data["class"])
+    player.hp = save_data["hp"]
+    player.max_hp = save_data["max_hp"]
+    player.stats.set_base("attack", save_data["attack"])
+    player.stats.set_base("defense", save_data["defense"])
+    player.level = save_data["level"]
+    player.exp = save_data["exp"]
+    player.skills = save_data["skills"]
+    player.inventory = Inventory()  # Ensure Inventory is initialized
+
+    # Re-load the player's items from the save data (without triggering add_item logic)
+    for item_id, entry in save_data["inventory"].items():
+        if isinstance(entry, dict):  # An item that is not in the catalog, saved in full
+            item = Item(entry["name"], entry["description"], entry.get("type", "misc"),
+                        price=entry.get("price", 0), item_id=item_id)
+            player.inventory.store(item, entry.get("quantity", 1))
+        elif item_id in get_items():
+            player.inventory.store(get_item(item_id), entry)
+        else:
+            emit("unknown_saved_item", item_id=item_id)
+
+    player.inventory.gold = save_data["gold"]
+
+    if save_data["location"]:
+        player.current_location = location.find_location(save_data["location"])
+        if player.current_location:
+            player.current_location.apply_effect(player)
+    return player
+
+def _database():
+    global _save_database
+    if _save_database is None or os.path.dirname(_save_database.path) != SAVE_DIR:
+        _save_database = SaveDatabase(SAVE_DIR)
+    return _save_database
+
+def _journal_for(name):
+    save_journal = _journals.get(name)
+    if save_journal is None:
+        save_journal = _journals[name] = journal.SaveJournal.open(SAVE_DIR, name, upgrade_save_data, SAVE_FORMAT)
+    return save_journal
+
+def offload_disk_work(executor):
+    """
+    Run save, load and listing work on `executor` instead of the event loop. The server uses a
+    single worker thread, which also keeps that work in order and off the shared state's toes.
+    """
+    global _disk_executor
+    _disk_executor = executor
+
+async def disk_work(function, *args):
+    """Call a blocking save/load/listing function, on the disk executor if there is one."""
+    if _disk_executor is None:
+        return function(*args)
+    recorder = ListSink()  # Sinks write to the session's connection, which belongs to the event loop
+
+    def run():
+        with use_bus(EventBus([recorder])):
+            return function(*args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_disk_executor, run)
+    finally:
+        recorder.replay(current_bus())
+
+def valid_name(name):
+    """
+    True if `name` can be used as a character (and save file) name. The pattern leaves out
+    path separators and dots, so a name cannot reach outside SAVE_DIR. Emits invalid_name if not.
+    """
+    if NAME_PATTERN.fullmatch(name) and name.strip():
+        return True
+    emit("invalid_name")
+    return False
+
+def save_game(player):
+    """Save the player's data, appending only what changed since the last save."""
+    if not valid_name(player.name):
+        return
+    if SAVE_BACKEND == "sqlite":
+        _database().save(player_to_save_data(player))
+    else:
+        _journal_for(player.name).record(player_to_save_data(player))
+    emit("game_saved", name=player.name)
+
+def autosave(player):
+    """Quietly save after a turn. Cheap when little has changed, since only a delta is written."""
+    if not valid_name(player.name):
+        return
+    if SAVE_BACKEND == "sqlite":
+        _database().save(player_to_save_data(player))
+    else:
+        _journal_for(player.name).record(player_to_save_data(player))
+
+def compact_save(name):
+    """Fold a character's journal, if it has any entries, into a fresh snapshot."""
+    if SAVE_BACKEND == "sqlite":
+        return  # The database has no journal to fold
+    save_journal = _journals.get(name)
+    if save_journal is not None and save_journal.state is not None and save_journal.entries:
+        save_journal.compact()
 
 def load_game(name):
-    """Load the player's data from a file."""
+    """Load the player's data from the snapshot file (JSON or binary) plus its journal."""
+    if not valid_name(name):
+        return None
+    if SAVE_BACKEND == "sqlite":
+        return _load_from_database(name)
     try:
-        with open(f"{SAVE_DIR}/{name}.json", "r") as f:
-            save_data = json.load(f)
-
-        # Re-create the player character
-        player = Character(save_data["name"], save_data["class"])
-        player.hp = save_data["hp"]
-        player.max_hp = save_data["max_hp"]
-        player.attack = save_data["attack"]
-        player.defense = save_data["defense"]
-        player.level = save_data["level"]
-        player.exp = save_data["exp"]
-        player.skills = save_data["skills"]
-        player.inventory = Inventory()  # Ensure Inventory is initialized
-
-        # Re-load the player's items from the save data (without triggering add_item logic)
-        for item_data in save_data["inventory"]:
-            item_type = item_data.get("type", "misc")  # Default to "misc" if 'type' is missing
-            item = Item(item_data["name"], item_data["description"], item_type)
-            player.inventory.items.append(item)  # Directly append to avoid 'add_item' triggering
-
-        player.inventory.gold = save_data["gold"]
-
-        if save_data["location"]:
-            player.current_location = locations.get(save_data["location"])
-            if player.current_location:
-                player.current_location.apply_effect(player)
-
-        print(f"Game loaded for {player.name}.")
+        save_data, entries = journal.load(SAVE_DIR, name, upgrade_save_data, repair=True)
+        player = player_from_save_data(save_data)
+        _journals[name] = journal.SaveJournal(SAVE_DIR, name, save_data, entries, SAVE_FORMAT)
+        emit("game_loaded", name=player.name)
         return player
     except FileNotFoundError:
-        print("Save file not found.")
+        emit("save_not_found", name=name)
+        return None
+    except KeyError as e:
+        emit("save_missing_key", name=name, key=str(e))
         return None
+    except (ValueError, TypeError) as e:  # A corrupt snapshot or journal (SaveFormatError is a ValueError)
+        emit("save_unreadable", name=name, error=str(e))
+        return None
+
+def _load_from_database(name):
+    try:
+        save_data = _database().load(name)
+        if save_data is None:
+            emit("save_not_found", name=name)
+            return None
+        player = player_from_save_data(upgrade_save_data(save_data))
     except KeyError as e:
-        print(f"Error: Missing key in save data - {e}")
+        emit("save_missing_key", name=name, key=str(e))
         return None
+    except (ValueError, TypeError) as e:
+        emit("save_unreadable", name=name, error=str(e))
+        return None
+    emit("game_loaded", name=player.name)
+    return player
+
+def _saved_summaries():
+    """Summaries of every save, re-parsing only saves that changed since the last listing."""
+    global _save_index
+    if SAVE_BACKEND == "sqlite":
+        return _database().summaries()
+    if _save_index is None or _save_index.save_dir != SAVE_DIR:
+        _save_index = SaveIndex(SAVE_DIR, upgrade_save_data)
+    _save_index.refresh()
+    return _save_index.summaries()
 
 # View all saved characters' stats as before
 def view_all_saved_stats():
     """Display stats of all saved characters."""
     if not os.path.exists(SAVE_DIR):
-        print("No saved characters found.")
+        emit("no_saves")
         return
 
-    print("\n--- All Saved Characters' Stats ---")
-    for filename in os.listdir(SAVE_DIR):
-        if filename.endswith(".json"):
-            with open(os.path.join(SAVE_DIR, filename), "r") as f:
-                save_data = json.load(f)
-                print(f"\nCharacter: {save_data['name']}")
-                print(f"  Class: {save_data['class']}")
-                print(f"  Level: {save_data['level']}")
-                print(f"  HP: {save_data['hp']}/{save_data['max_hp']}")
-                print(f"  Attack: {save_data['attack']}")
-                print(f"  Defense: {save_data['defense']}")
-                print(f"  EXP: {save_data['exp']}")
-                print(f"  Gold: {save_data['gold']}")
-                print(f"  Location: {save_data['location']}")
-                print(f"  Skills: {', '.join(save_data['skills']) if save_data['skills'] else 'None'}")
-    print("\n--- End of Stats ---")
+    emit("text", text="\n--- All Saved Characters' Stats ---")
+    for save_data in _saved_summaries():
+        emit("text", text=f"\nCharacter: {save_data['name']}")
+        emit("text", text=f"  Class: {save_data['class']}")
+        emit("text", text=f"  Level: {save_data['level']}")
+        emit("text", text=f"  HP: {save_data['hp']}/{save_data['max_hp']}")
+        emit("text", text=f"  Attack: {save_data['attack']}")
+        emit("text", text=f"  Defense: {save_data['defense']}")
+        emit("text", text=f"  EXP: {save_data['exp']}")
+        emit("text", text=f"  Gold: {save_data['gold']}")
+        emit("text", text=f"  Location: {save_data['location']}")
+        emit("text", text=f"  Skills: {', '.join(save_data['skills']) if save_data['skills'] else 'None'}")
+    emit("text", text="\n--- End of Stats ---")
 
 # Game Menu and Main Loop
-def main_menu():
-    """Displays the main menu and handles new game or load game options."""
-    print("Welcome to the Adventure Game!")
+async def main_menu(io):
+    """Displays the main menu and handles new game or load game options. Returns None to quit."""
+    io.say("Welcome to the Adventure Game!")
     while True:
-        choice = input("Choose an option: [New Game, Load Game, View Saves, Quit]: ").lower()
+        choice = (await io.ask("Choose an option: [New Game, Load Game, View Saves, Quit]: ")).lower()
 
         if choice == "new game":
-            name = input("Enter your character's name: ")
-            print("Choose your class: [Warrior, Mage, Rogue, Archer, Paladin, Assassin]")
-            char_class = input("Enter class name: ")
+            name = await io.ask("Enter your character's name: ")
+            while not valid_name(name):
+                name = await io.ask("Enter your character's name: ")
+            io.say("Choose your class: [Warrior, Mage, Rogue, Archer, Paladin, Assassin]")
+            char_class = await io.ask("Enter class name: ")
             return Character(name, char_class)
 
         elif choice == "load game":
-            name = input("Enter the name of the character to load: ")
-            player = load_game(name)
+            name = await io.ask("Enter the name of the character to load: ")
+            player = await disk_work(load_game, name)
             if player:
                 return player  # Successfully loaded character
 
         elif choice == "view saves":
-            view_all_saved_stats()
+            await disk_work(view_all_saved_stats)
 
         elif choice == "quit":
-            print("Goodbye!")
-            exit()
+            io.say("Goodbye!")
+            return None
 
         else:
-            print("Invalid option. Try again.")
-
-def check_win_condition():
-    """Check if all enemies in each location have been defeated."""
-    for location, enemies in enemies_by_location.items():
-        if any(enemy.is_alive() for enemy in enemies):
-            return False  # Game is not won yet; enemies still remain
-    return True  # All enemies defeated; player wins!
-
-def main():
-    player = main_menu()  # Start at the main menu
-    shop = Shop()  # Initialize the shop
-
-    def change_location(location_name):
+            io.say("Invalid option. Try again.")
+
+def check_win_condition(world):
+    """Check if all enemies in each location have been defeated (a counter lookup, not a scan)."""
+    return world.is_won()
+
+class Session:
+    """Everything one player's game needs: their character, shop and world, and where I/O goes."""
+    def __init__(self, io, player):
+        self.io = io
+        self.player = player
+        self.shop = Shop()  # Initialize the shop
+        self.world = World.spawn_default()  # This player's own enemies
+        self.running = True
+
+    def change_location(self, location_name):
+        player = self.player
         if player.current_location:
             player.current_location.remove_effect(player)
 
-        new_location = locations.get(location_name)
+        new_location = location.locations.get(location_name)
         if not new_location:
-            print("Unknown location.")
+            self.io.say("Unknown location.")
             return
 
-        print(f"\nYou travel to {new_location.name}. {new_location.description}")
+        self.io.say(f"\nYou travel to {new_location.name}. {new_location.description}")
         new_location.apply_effect(player)
         player.current_location = new_location
-        print()  # Extra space after location change
+        self.io.say()  # Extra space after location change
+
+def end_if_won(session):
+    """End the game with a victory message once every enemy is defeated. Returns True if it ended."""
+    if not check_win_condition(session.world):
+        return False
+    session.io.say("\nCongratulations! You have defeated all enemies in each location and won the game!")
+    session.io.say("Thank you for playing!")
+    session.running = False  # End the game loop if player has won
+    return True
+
+# Command handlers for the main game loop. Each takes the session and returns when the command is done.
+async def explore(session):
+    io, player, world = session.io, session.player, session.world
+    if player.current_location:
+        location_name = player.current_location.name
+        if not world.is_clear(location_name):
+            await combat(player, world.enemies_at(location_name), io)  # Engage in combat
+
+            # Check for win condition after combat
+            if end_if_won(session):
+                return
+        elif HORDE_SIZE and enemy.templates_by_location.get(location_name):
+            await horde_encounter(session, enemy.templates_by_location[location_name])
+        else:
+            io.say(f"There are no enemies in the {location_name}.")
+    else:
+        io.say("You need to be in a location to explore!")
+    io.say()  # Added blank line for spacing
 
-    # Game loop
-    while player.hp > 0:
-        action = input(
-            "\nWhat would you like to do? [Explore, Check Inventory, Travel, Visit Shop, Use Skill, Save, View Stats, Quit]: ").lower()
-
-        if action == "explore":
-            if player.current_location:
-                location_enemies = enemies_by_location.get(player.current_location.name)
-                if location_enemies:
-                    combat(player, location_enemies)  # Engage in combat
-
-                    # Check for win condition after combat
-                    if check_win_condition():
-                        print("\nCongratulations! You have defeated all enemies in each location and won the game!")
-                        print("Thank you for playing!")
-                        break  # End the game loop if player has won
-                else:
-                    print(f"There are no enemies in the {player.current_location.name}.")
+async def horde_encounter(session, templates):
+    try:
+        from horde import Horde, horde_combat  # Needs NumPy, so it is only imported once a horde appears
+        horde = Horde.spawn(templates, HORDE_SIZE)
+    except ImportError as e:
+        session.io.say(str(e))
+        return
+    await horde_combat(session.player, horde, session.io)
+
+async def check_inventory(session):
+    io, player = session.io, session.player
+    while True:
+        player.inventory.display_inventory()
+        sub_action = (await io.ask("Manage inventory: [Sort, Discard, Sell, Use Item, Exit]: ")).lower()
+        if sub_action == "sort":
+            player.inventory.sort_items()
+        elif sub_action == "discard":
+            item_name = await io.ask("Enter item name to discard: ")
+            player.inventory.remove_item(item_name)
+        elif sub_action == "sell":
+            item_name = await io.ask("Enter item name to sell: ")
+            player.inventory.sell_item(item_name)
+        elif sub_action == "use item":
+            item_name = await io.ask("Enter item name to use: ")
+            if player.inventory.has_item(item_name):
+                player.inventory.use_item(item_name, player)
+                io.say()  # Extra space after using item
             else:
-                print("You need to be in a location to explore!")
-            print()  # Added blank line for spacing
-
-
-        elif action == "check inventory":
-            while True:
-                player.inventory.display_inventory()
-                sub_action = input("Manage inventory: [Sort, Discard, Sell, Use Item, Exit]: ").lower()
-                if sub_action == "sort":
-                    player.inventory.sort_items()
-                elif sub_action == "discard":
-                    item_name = input("Enter item name to discard: ")
-                    player.inventory.remove_item(item_name)
-                elif sub_action == "sell":
-                    item_name = input("Enter item name to sell: ")
-                    player.inventory.sell_item(item_name)
-                elif sub_action == "use item":
-                    item_name = input("Enter item name to use: ")
-                    item = player.inventory.get_item(item_name)  # Retrieve the item from inventory
-                    if item:
-                        player.inventory.use_item(item)  # Assuming there's a `use_item` method in `Inventory`
-                        print()  # Extra space after using item
-                    else:
-                        print(f"Item '{item_name}' not found in your inventory.")
-                elif sub_action == "exit":
-                    print("Exiting inventory.")
-                    break
-                else:
-                    print("Invalid inventory management action. Please choose again.")
-                    print()  # Extra space after an invalid action
-
-        elif action == "travel":
-            print("Available locations: " + ", ".join(locations.keys()))
-            location_choice = input("Enter the name of the location you want to travel to, or type 'exit' to cancel: ")
-            if location_choice.lower() == "exit":
-                print("Travel canceled.")
+                io.say(f"Item '{item_name}' not found in your inventory.")
+        elif sub_action == "exit":
+            io.say("Exiting inventory.")
+            break
+        else:
+            io.say("Invalid inventory management action. Please choose again.")
+            io.say()  # Extra space after an invalid action
+
+async def travel(session):
+    io = session.io
+    io.say("Available locations: " + ", ".join(location.locations))
+    location_choice = await io.ask("Enter the name of the location you want to travel to, or type 'exit' to cancel: ")
+    if location_choice.lower() == "exit":
+        io.say("Travel canceled.")
+    else:
+        session.change_location(location_choice)
+
+async def visit_shop(session):
+    io, player, shop = session.io, session.player, session.shop
+    while True:
+        shop.display_items()
+        shop_action = (await io.ask("Would you like to buy or sell? [Buy, Sell, Exit]: ")).lower()
+        if shop_action == "buy":
+            text = await io.ask("Enter items to buy (e.g. Potion x5, Shield), or type 'exit' to cancel: ")
+            if text.lower() == "exit":
+                io.say("Purchase canceled.")
             else:
-                change_location(location_choice)
-
-        elif action == "visit shop":
-            while True:
-                shop.display_items()
-                shop_action = input("Would you like to buy or sell? [Buy, Sell, Exit]: ").lower()
-                if shop_action == "buy":
-                    item_name = input("Enter item name to buy, or type 'exit' to cancel: ")
-                    if item_name.lower() == "exit":
-                        print("Purchase canceled.")
-                    else:
-                        shop.buy_item(item_name, player)
-                elif shop_action == "sell":
-                    item_name = input("Enter item name to sell, or type 'exit' to cancel: ")
-                    if item_name.lower() == "exit":
-                        print("Sale canceled.")
-                    else:
-                        player.inventory.sell_item(item_name)
-                elif shop_action == "exit":
-                    print("Exiting shop.")
-                    break
-                else:
-                    print("Invalid shop action. Please choose again.")
-                    print()  # Extra space after shop actions
-
-        elif action == "use skill":
-            print(f"Available skills: {', '.join(player.skills)}")
-            skill_choice = input("Enter skill to use, or type 'exit' to cancel: ")
-            if skill_choice.lower() == "exit":
-                print("Skill usage canceled.")
-            elif player.current_location:
-                location_enemies = enemies_by_location.get(player.current_location.name)
-                if location_enemies:
-                    enemy = choice(location_enemies)
-                    player.use_skill(skill_choice, enemy)
-                    print()  # Extra space after using skill
+                order = parse_order(text)
+                if order:
+                    shop.buy(player, order)  # The whole order goes through, or none of it
                 else:
-                    print(f"No enemies in {player.current_location.name} to use skills on.")
-                    print()  # Extra space after no enemies found
+                    emit("invalid_order")
+        elif shop_action == "sell":
+            text = await io.ask("Enter items to sell (e.g. Fur Pelt x3), or type 'exit' to cancel: ")
+            if text.lower() == "exit":
+                io.say("Sale canceled.")
             else:
-                print("You need to be in a location to use skills!")
-                print()  # Extra space after error
-
-        elif action == "save":
-            save_game(player)
-            print()  # Extra space after saving
+                order = parse_order(text)
+                if order:
+                    shop.sell(player, order)
+                else:
+                    emit("invalid_order")
+        elif shop_action == "exit":
+            io.say("Exiting shop.")
+            break
+        else:
+            io.say("Invalid shop action. Please choose again.")
+            io.say()  # Extra space after shop actions
+
+async def use_skill(session):
+    io, player = session.io, session.player
+    io.say(f"Available skills: {', '.join(player.skills)}")
+    skill_choice = await io.ask("Enter skill to use, or type 'exit' to cancel: ")
+    if skill_choice.lower() == "exit":
+        io.say("Skill usage canceled.")
+        return
+    # Damage skills act on the enemies here; healing and buffs work anywhere
+    here = player.current_location
+    targets = session.world.enemies_at(here.name) if here else []
+    if player.use_skill(skill_choice, targets) and end_if_won(session):
+        return
+    io.say()  # Extra space after using skill
+
+async def save(session):
+    await disk_work(save_game, session.player)
+    session.io.say()  # Extra space after saving
+
+async def view_stats(session):
+    await disk_work(view_all_saved_stats)
+
+async def quit_game(session):
+    if AUTOSAVE:
+        await disk_work(autosave, session.player)
+    await disk_work(compact_save, session.player.name)  # The next load reads one snapshot instead of replaying the journal
+    session.io.say("Thanks for playing!")
+    session.running = False
+
+COMMANDS = {
+    "explore": explore,
+    "check inventory": check_inventory,
+    "travel": travel,
+    "visit shop": visit_shop,
+    "use skill": use_skill,
+    "save": save,
+    "view stats": view_stats,
+    "quit": quit_game,
+}
+
+MENU_PROMPT = "\nWhat would you like to do? [Explore, Check Inventory, Travel, Visit Shop, Use Skill, Save, View Stats, Quit]: "
+
+async def play(io):
+    """Run one complete game (main menu plus game loop) over the given I/O."""
+    profiler = profiling.active
+    commands = COMMANDS
+    if profiler:
+        io = profiling.ProfiledIO(io)  # So time spent at prompts is not counted
+        commands = profiler.wrap_commands(COMMANDS)
+
+    player = await main_menu(io)  # Start at the main menu
+    if player is None:
+        return
+    session = Session(io, player)
 
-        elif action == "view stats":
-            view_all_saved_stats()
+    # Game loop
+    try:
+        while player.hp > 0 and session.running:
+            action = (await io.ask(MENU_PROMPT)).lower()
+            handler = commands.get(action)
+            if handler:
+                await handler(session)
+            else:
+                io.say("Invalid action. Try again.")
+                io.say()  # Extra space after invalid action
 
-        elif action == "quit":
-            print("Thanks for playing!")
-            break
+            if AUTOSAVE and session.running and player.hp > 0:
+                await disk_work(autosave, player)  # Only the fields that changed this turn are written
+    finally:
+        session.world.release()
 
-        else:
-            print("Invalid action. Try again.")
-            print()  # Extra space after invalid action
+def main():
+    parser = argparse.ArgumentParser(description="Play the adventure game.")
+    parser.add_argument("--profile", nargs="?", const=profiling.DEFAULT_PATH, metavar="PATH",
+                        help="Time every command and combat turn and write a report here at exit")
+    parser.add_argument("--cprofile", action="store_true", help="With --profile, also run each command under cProfile")
+    args = parser.parse_args()
+    if args.profile:
+        profiling.enable(args.profile, args.cprofile)
+    asyncio.run(play(ConsoleIO()))
 
 if __name__ == "__main__":
     main()
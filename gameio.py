@@ -0,0 +1,49 @@
+# gameio.py
+
+"""
+I/O for the game's menus.
+
+Menu and combat code never calls input() or print() directly. It goes through an I/O
+object with an async ask() and a plain say(), so the same code can run on a terminal, over
+a network connection, or from a script.
+"""
+
+
+class ConsoleIO:
+    """Terminal I/O. Reading blocks, which is fine with a single player per process."""
+    async def ask(self, prompt):
+        return input(prompt)
+
+    def say(self, text=""):
+        print(text)
+
+
+class ScriptExhausted(Exception):
+    """A scripted session asked for more input than its script has."""
+
+
+class ScriptedIO:
+    """
+    Answers prompts from a list of lines, for benchmarks and automated runs.
+
+    `auto` maps prompts to a fixed answer that is given without using up a script line
+    (e.g. always attack in combat). Output is discarded unless `echo` is set.
+    """
+    def __init__(self, lines, auto=None, echo=False):
+        self.lines = iter(lines)
+        self.auto = auto or {}
+        self.echo = echo
+
+    async def ask(self, prompt):
+        answer = self.auto.get(prompt)
+        if answer is None:
+            answer = next(self.lines, None)
+            if answer is None:
+                raise ScriptExhausted(prompt)
+        if self.echo:
+            print(prompt + answer)
+        return answer
+
+    def say(self, text=""):
+        if self.echo:
+            print(text)
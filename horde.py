@@ -0,0 +1,206 @@
+# horde.py
+
+"""
+Horde encounters.
+
+A Horde keeps a swarm of enemies as NumPy columns (hp, attack, defense, an alive mask and
+the template each row was spawned from) instead of one Enemy object apiece. Each step of a
+turn is a few array operations, whatever the size of the swarm: area damage, the horde's
+counter-attack, finding who fell, and adding up the experience and loot they leave.
+
+Only the front of the horde can reach the player: single-target attacks hit the first
+living enemy, and the first ENGAGED living enemies strike back each turn.
+
+Hordes are met when exploring a cleared area with ADVENTURE_HORDE_SIZE set. They need
+NumPy; the rest of the game does not, so game.py imports this module only when one appears.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for hordes, not to play the game
+    np = None
+
+import profiling
+from combat import ATTACK, DEFEND, POWER_ATTACK, USE_ITEM
+from enemy import Enemy
+from events import emit
+from rng import rng_service
+from skills import EFFECTS, get_skill
+from stats import ENCOUNTER, STANCE, Modifier
+
+ENGAGED = 5  # Living enemies at the front that can attack the player each turn
+
+USE_SKILL = "5"
+HORDE_PROMPT = "Choose an action: [1] Attack [2] Power Attack [3] Defend [4] Use Item [5] Use Skill: "
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Horde encounters need NumPy. Install it with: pip install numpy")
+
+
+def _horde_rng():
+    """A NumPy generator seeded from the game's RNG service, so seeded games repeat their hordes."""
+    return np.random.default_rng(rng_service.stream().seed)
+
+
+class Horde:
+    def __init__(self, templates, template_ids, rng=None):
+        _require_numpy()
+        self.templates = tuple(templates)
+        self.template_ids = np.asarray(template_ids, dtype=np.intp)  # Row -> index into templates
+        self.rng = rng or _horde_rng()
+
+        # Per-template values, spread to one row per enemy. HP is a float: power attacks deal halves
+        self.hp = np.array([t.hp for t in self.templates], dtype=np.float64)[self.template_ids]
+        self.attack = np.array([t.attack for t in self.templates], dtype=np.int64)[self.template_ids]
+        self.defense = np.array([t.defense for t in self.templates], dtype=np.int64)[self.template_ids]
+        self.alive = self.hp > 0
+        self.remaining = int(np.count_nonzero(self.alive))
+
+        # Experience for defeating each template. combat() asks a defeated enemy, whose HP is 0 by then
+        self.exp_rewards = np.array([Enemy(t.name, 0, t.attack, t.defense, t.location).exp_reward()
+                                     for t in self.templates], dtype=np.int64)
+
+    @classmethod
+    def spawn(cls, templates, size, rng=None):
+        """A horde of `size` enemies, each drawn at random from `templates`."""
+        _require_numpy()
+        rng = rng or _horde_rng()
+        return cls(templates, rng.integers(0, len(templates), size), rng)
+
+    def __len__(self):
+        return len(self.hp)
+
+    def name_of(self, index):
+        return self.templates[self.template_ids[index]].name
+
+    def front(self, count=ENGAGED):
+        """Row indexes of the first `count` living enemies."""
+        return np.flatnonzero(self.alive)[:count]
+
+    def hit_front(self, attacker, damage):
+        """Deal `damage` to the enemy at the front. Returns its row index."""
+        index = self.front(1)[0]
+        self.hp[index] -= damage
+        emit("horde_hit", name=attacker.name, target=self.name_of(index), damage=damage)
+        return index
+
+    def hit_all(self, damage):
+        """Deal `damage` to every living enemy. Returns how many were hit."""
+        self.hp[self.alive] -= damage
+        return self.remaining
+
+    def use_skill(self, user, skill_name):
+        """Use a skill against the horde: area skills hit everyone, others one random enemy."""
+        skill = get_skill(skill_name) if skill_name in user.skills else None
+        if skill is None:
+            emit("unknown_skill", name=user.name, skill=skill_name)
+            return False
+        if skill.effect is not EFFECTS["damage"]:
+            return skill.use(user, ())  # Heals and buffs do not need targets
+        damage = user.attack * skill.power
+        if skill.area:
+            count = self.hit_all(damage)
+            emit("skill_area_damage", name=user.name, skill=skill.name, count=count, damage=damage)
+        else:
+            index = self.rng.choice(np.flatnonzero(self.alive))
+            self.hp[index] -= damage
+            emit(skill.event, name=user.name, skill=skill.name, target=self.name_of(index), damage=damage)
+        return True
+
+    def attack_player(self, player):
+        """The front of the horde strikes, each like Enemy.attack_player. Returns the total damage."""
+        attackers = self.front()
+        damage = int(np.maximum(1, self.attack[attackers] - player.defense).sum())
+        player.hp -= damage
+        emit("horde_attack", count=len(attackers), target=player.name, damage=damage)
+        return damage
+
+    def loot(self, defeated):
+        """Items dropped by the defeated rows: each enemy drops one of its template's items at random."""
+        kills = np.bincount(self.template_ids[defeated], minlength=len(self.templates))
+        dropped = {}
+        for template, count in zip(self.templates, kills):
+            drops = template.drop_items
+            if count and drops:
+                for item, quantity in zip(drops, self.rng.multinomial(count, [1 / len(drops)] * len(drops))):
+                    if quantity:
+                        dropped[item] = dropped.get(item, 0) + int(quantity)
+        return dropped
+
+    def award(self, player):
+        """Remove enemies defeated since the last call and give the player their experience and loot."""
+        defeated = self.alive & (self.hp <= 0)
+        kills = int(np.count_nonzero(defeated))
+        if not kills:
+            return 0
+        self.hp[defeated] = 0
+        self.alive[defeated] = False
+        self.remaining -= kills
+
+        exp = int(self.exp_rewards[self.template_ids[defeated]].sum())
+        emit("horde_defeated", count=kills, name=player.name, exp=exp)
+        player.gain_experience(exp)
+        for item, quantity in self.loot(defeated).items():
+            player.inventory.add_item(item, quantity)
+        return kills
+
+
+async def horde_combat(player, horde, io):
+    """Fight a whole horde, reading actions from `io` like combat()."""
+    io.say(f"A horde of {horde.remaining} enemies swarms out of the {player.current_location.name}!")
+    profiler = profiling.active  # None unless profiling mode is on
+
+    while player.hp > 0 and horde.remaining:
+        io.say(f"\n{player.name} HP: {player.hp} | Horde: {horde.remaining} enemies left")
+        action = await io.ask(HORDE_PROMPT)
+        if profiler:
+            turn_started = profiler.clock(io)
+        io.say()  # Extra space
+
+        if action == ATTACK:  # Same roll as Character.attack_enemy
+            damage = player.attack + player.rng.randint(-3, 3)
+            if player.rng.random() < 0.2:
+                damage *= 2
+                emit("critical_hit", attacker=player.name)
+            horde.hit_front(player, damage)
+
+        elif action == POWER_ATTACK:
+            target = horde.front(1)[0]
+            horde.hit_front(player, max(1, player.attack * 1.5 - int(horde.defense[target])))
+            player.stats.add_modifier(Modifier("stance", STANCE, "defense", add=-2))
+            io.say(f"{player.name} feels more vulnerable after the Power Attack.")
+
+        elif action == DEFEND:
+            player.stats.add_modifier(Modifier("stance", STANCE, "defense", add=5))
+            io.say(f"{player.name} takes a defensive stance, raising defense by 5.")
+
+        elif action == USE_ITEM:
+            item_name = await io.ask("Enter item name to use: ")
+            player.inventory.use_item(item_name, player)
+
+        elif action == USE_SKILL:
+            io.say(f"Available skills: {', '.join(player.skills)}")
+            skill_name = await io.ask("Enter skill to use: ")
+            horde.use_skill(player, skill_name)
+
+        else:
+            io.say("Invalid action. Please choose a number between 1 and 5.")
+
+        horde.award(player)
+        if horde.remaining:
+            horde.attack_player(player)
+
+        # Reset defense modifications after each turn
+        player.stats.remove_modifier("stance", "defense")
+
+        if profiler:
+            profiler.record("horde turn", profiler.clock(io) - turn_started)
+
+    player.stats.remove_layer(ENCOUNTER)  # Skill buffs last for one encounter
+
+    if player.hp <= 0:
+        io.say("You have been overwhelmed by the horde...")
+    else:
+        io.say("The horde has been defeated!")
@@ -1,64 +1,136 @@
 # inventory.py
 
+from events import emit
+from stats import BUFF
+
 class Item:
-    def __init__(self, name, description, item_type, price=0):
-        self.name = name
-        self.description = description
-        self.item_type = item_type  # E.g., 'heal', 'boost', 'passive', etc.
-        self.price = price  # Price for buying/selling
+    """
+    An item definition. Catalog items are shared by every inventory, shop and enemy that
+    holds them, so instances are immutable once created.
+    """
+    __slots__ = ("item_id", "name", "description", "item_type", "price", "attack_bonus", "defense_bonus")
+
+    def __init__(self, name, description, item_type, price=0, attack_bonus=0, defense_bonus=0, item_id=None):
+        fields = {
+            "item_id": item_id or name.lower().replace(" ", "_"),  # Key in the item catalog and in saves
+            "name": name,
+            "description": description,
+            "item_type": item_type,  # E.g., 'heal', 'boost', 'passive', 'Weapon', 'Armor', etc.
+            "price": price,  # Price for buying/selling
+            "attack_bonus": attack_bonus,
+            "defense_bonus": defense_bonus,
+        }
+        for field, value in fields.items():
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError(f"Item is immutable; cannot set '{field}'")
 
     def __repr__(self):
         return f"{self.name} - {self.description} (Type: {self.item_type}, Price: {self.price} gold)"
 
 
+class ItemStack:
+    """One kind of item and how many copies of it are held."""
+    __slots__ = ("item", "quantity")
+
+    def __init__(self, item, quantity=1):
+        self.item = item
+        self.quantity = quantity
+
+    def __repr__(self):
+        if self.quantity > 1:
+            return f"{self.item} x{self.quantity}"
+        return repr(self.item)
+
+
 class Inventory:
+    __slots__ = ("stacks", "gold")
+
     def __init__(self):
-        self.items = []
+        self.stacks = {}  # Case-folded item name -> ItemStack, in the order items were first added
         self.gold = 100  # Starting gold for the player
 
-    def add_item(self, item):
-        self.items.append(item)
-        print(f"{item.name} added to inventory.")
+    @property
+    def items(self):
+        """Every held item, one entry per copy. Builds a new list, so avoid it in hot paths."""
+        return [stack.item for stack in self.stacks.values() for _ in range(stack.quantity)]
+
+    def __len__(self):
+        return sum(stack.quantity for stack in self.stacks.values())
+
+    def has_item(self, item_name):
+        return item_name.casefold() in self.stacks
+
+    def get_item(self, item_name):
+        """Return the held item with this name, or None."""
+        stack = self.stacks.get(item_name.casefold())
+        return stack.item if stack else None
+
+    def quantity(self, item_name):
+        stack = self.stacks.get(item_name.casefold())
+        return stack.quantity if stack else 0
+
+    def store(self, item, quantity=1):
+        """Add items without announcing them (used when restoring saves and in simulations)."""
+        key = item.name.casefold()
+        stack = self.stacks.get(key)
+        if stack:
+            stack.quantity += quantity
+        else:
+            self.stacks[key] = ItemStack(item, quantity)
+
+    def take(self, item_name, quantity=1):
+        """Remove items by name without announcing it. Returns the item, or None if not enough are held."""
+        key = item_name.casefold()
+        stack = self.stacks.get(key)
+        if not stack or stack.quantity < quantity:
+            return None
+        stack.quantity -= quantity
+        if stack.quantity == 0:
+            del self.stacks[key]
+        return stack.item
+
+    def add_item(self, item, quantity=1):
+        self.store(item, quantity)
+        emit("item_added" if quantity == 1 else "items_added", item=item.name, quantity=quantity)
 
     def remove_item(self, item_name):
-        for item in self.items:
-            if item.name.lower() == item_name.lower():
-                self.items.remove(item)
-                print(f"{item.name} removed from inventory.")
-                return
-        print("Item not found in inventory.")
+        item = self.take(item_name)
+        if item:
+            emit("item_removed", item=item.name)
+        else:
+            emit("item_not_found", item=item_name)
 
     def use_item(self, item_name, character):
         """Use an item, applying its effect based on type."""
-        for item in self.items:
-            if item.name.lower() == item_name.lower():
-                if item.item_type == "heal":
-                    character.hp = min(character.max_hp, character.hp + 20)
-                    print(f"{character.name} used {item.name} and restored HP!")
-                elif item.item_type == "boost":
-                    character.attack += 5
-                    print(f"{character.name} used {item.name}, increasing attack!")
-                self.items.remove(item)
-                return
-        print("Item not found in inventory.")
+        item = self.take(item_name)
+        if not item:
+            emit("item_not_found", item=item_name)
+            return
+        if item.item_type == "heal":
+            character.hp = min(character.max_hp, character.hp + 20)
+            emit("item_healed", name=character.name, item=item.name, hp=character.hp)
+        elif item.item_type == "boost":
+            character.stats.stack_modifier("boost", BUFF, "attack", 5)
+            emit("item_boosted", name=character.name, item=item.name, attack=character.attack)
 
     def sort_items(self):
-        self.items.sort(key=lambda x: x.name)
-        print("Inventory sorted by item name.")
+        self.stacks = dict(sorted(self.stacks.items(), key=lambda entry: entry[1].item.name))
+        emit("inventory_sorted")
 
     def display_inventory(self):
-        print(f"Gold: {self.gold}")
-        if not self.items:
-            print("Inventory is empty.")
+        emit("inventory_gold", gold=self.gold)
+        if not self.stacks:
+            emit("inventory_empty")
         else:
-            for item in self.items:
-                print(item)
+            for stack in self.stacks.values():
+                emit("text", text=str(stack))
 
     def sell_item(self, item_name):
-        for item in self.items:
-            if item.name.lower() == item_name.lower():
-                self.gold += item.price
-                self.items.remove(item)
-                print(f"Sold {item.name} for {item.price} gold.")
-                return
-        print("Item not found in inventory.")
+        item = self.take(item_name)
+        if not item:
+            emit("item_not_found", item=item_name)
+            return
+        self.gold += item.price
+        emit("item_sold", item=item.name, price=item.price, gold=self.gold)
@@ -0,0 +1,208 @@
+# journal.py
+
+"""
+Append-only save journal.
+
+A save is a snapshot plus a journal (saves/<name>.journal) with one JSON line per save, holding only the fields that changed since the previous one.
+Every entry stores absolute values (new HP, new gold, new quantity of each changed item id),
+so replaying an entry twice is harmless. That keeps compaction safe even if the game stops
+between writing the new snapshot and truncating the journal.
+
+Snapshots are JSON (saves/<name>.json) or the binary format from save_codec
+(saves/<name>.sav). A save has one or the other; writing a snapshot in one format removes
+any snapshot in the other, so a save changes format the next time it is compacted.
+"""
+
+import json
+import os
+
+import save_codec
+
+COMPACT_EVERY = 100  # Journal entries to collect before folding them into the snapshot
+SNAPSHOT_EXTENSIONS = {"json": ".json", "binary": ".sav"}  # Snapshot format -> file extension
+
+
+def snapshot_path(save_dir, name, fmt="json"):
+    return os.path.join(save_dir, name + SNAPSHOT_EXTENSIONS[fmt])
+
+
+def snapshot_format(filename):
+    """The snapshot format of a file name in a saves directory, or None if it is not a snapshot."""
+    if filename.startswith("."):
+        return None
+    for fmt, extension in SNAPSHOT_EXTENSIONS.items():
+        if filename.endswith(extension):
+            return fmt
+    return None
+
+
+def save_names(save_dir):
+    """Yield the name of every save in `save_dir`, streaming the directory rather than listing it."""
+    seen = set()  # A save caught mid-conversion briefly has a snapshot in both formats
+    with os.scandir(save_dir) as it:
+        for entry in it:
+            fmt = snapshot_format(entry.name)
+            if fmt:
+                name = entry.name[:-len(SNAPSHOT_EXTENSIONS[fmt])]
+                if name not in seen:
+                    seen.add(name)
+                    yield name
+
+
+def journal_path(save_dir, name):
+    return os.path.join(save_dir, f"{name}.journal")
+
+
+def diff(old, new):
+    """Return the fields of `new` that differ from `old`, or None if nothing changed."""
+    delta = {key: value for key, value in new.items() if key != "inventory" and old.get(key) != value}
+
+    # The inventory maps item id -> quantity; only changed ids are recorded, with 0 for removed items
+    old_items = old.get("inventory", {})
+    new_items = new.get("inventory", {})
+    changed = {item_id: entry for item_id, entry in new_items.items() if old_items.get(item_id) != entry}
+    for item_id in old_items:
+        if item_id not in new_items:
+            changed[item_id] = 0
+    if changed:
+        delta["inventory"] = changed
+    return delta or None
+
+
+def apply_delta(state, delta):
+    """Apply one journal entry to a save dict in place."""
+    for key, value in delta.items():
+        if key != "inventory":
+            state[key] = value
+    if "inventory" in delta:
+        items = state.setdefault("inventory", {})
+        for item_id, entry in delta["inventory"].items():
+            if entry:
+                items[item_id] = entry
+            else:
+                items.pop(item_id, None)
+
+
+def read_snapshot(save_dir, name):
+    """Return (state, format) for a save's snapshot. Raises FileNotFoundError if there is none."""
+    try:
+        with open(snapshot_path(save_dir, name, "binary"), "rb") as f:
+            return save_codec.decode(f.read()), "binary"
+    except FileNotFoundError:
+        pass
+    with open(snapshot_path(save_dir, name), "r") as f:
+        return json.load(f), "json"
+
+
+def load(save_dir, name, upgrade=None, repair=False):
+    """
+    Read a snapshot and replay its journal. Raises FileNotFoundError if there is no save.
+    `upgrade`, if given, converts an older snapshot to the current layout before replaying.
+    With `repair`, a torn final line is cut off so that new entries are not appended to it.
+    """
+    state, _ = read_snapshot(save_dir, name)
+    if upgrade:
+        state = upgrade(state)
+    entries = 0
+    good_end = 0  # Bytes of the journal up to the end of the last complete entry
+    torn = False
+    try:
+        with open(journal_path(save_dir, name), "rb") as f:
+            for line in f:
+                try:
+                    delta = json.loads(line)
+                except ValueError:
+                    torn = True  # A torn final line from an interrupted write; everything before it is intact
+                    break
+                apply_delta(state, delta)
+                entries += 1
+                good_end += len(line)
+                torn = not line.endswith(b"\n")  # Complete, but the next entry would be glued to it
+    except FileNotFoundError:
+        pass
+    if torn and repair:
+        repair_journal(save_dir, name, good_end)
+    return state, entries
+
+
+def repair_journal(save_dir, name, size):
+    """Cut the journal back to its first `size` bytes, ending them with a newline if needed."""
+    with open(journal_path(save_dir, name), "r+b") as f:
+        f.truncate(size)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+
+def write_snapshot(save_dir, name, state, fmt="json"):
+    """Atomically replace the snapshot, in the given format, and empty the journal."""
+    if not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+    data = None
+    if fmt == "binary":
+        try:
+            data = save_codec.encode(state)
+        except save_codec.SaveFormatError:
+            fmt = "json"  # Values the binary layout cannot hold (huge stats, float exp); JSON takes anything
+    path = snapshot_path(save_dir, name, fmt)
+    tmp_path = path + ".tmp"
+    if data is not None:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+    else:
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=4)
+    os.replace(tmp_path, path)
+    for other in SNAPSHOT_EXTENSIONS:
+        if other != fmt:
+            try:
+                os.remove(snapshot_path(save_dir, name, other))
+            except FileNotFoundError:
+                pass
+    # Truncate only after the snapshot is in place; replaying stale entries is idempotent
+    with open(journal_path(save_dir, name), "w"):
+        pass
+
+
+class SaveJournal:
+    """Tracks the last saved state for one character and appends deltas against it."""
+    def __init__(self, save_dir, name, state=None, entries=0, fmt="json"):
+        self.save_dir = save_dir
+        self.name = name
+        self.fmt = fmt  # Snapshot format written on compaction
+        self.state = state  # Last state written to disk (snapshot + journal), or None if never saved
+        self.entries = entries
+
+    @classmethod
+    def open(cls, save_dir, name, upgrade=None, fmt="json"):
+        """Pick up an existing save from disk, if there is one."""
+        try:
+            state, entries = load(save_dir, name, upgrade, repair=True)
+        except FileNotFoundError:
+            return cls(save_dir, name, fmt=fmt)
+        return cls(save_dir, name, state, entries, fmt)
+
+    def record(self, new_state):
+        """Write whatever changed since the last save. Returns True if anything was written."""
+        if self.state is None:
+            self.compact(new_state)
+            return True
+
+        delta = diff(self.state, new_state)
+        if delta is None:
+            return False
+        with open(journal_path(self.save_dir, self.name), "a") as f:
+            f.write(json.dumps(delta, separators=(",", ":")) + "\n")
+        self.state = new_state
+        self.entries += 1
+        if self.entries >= COMPACT_EVERY:
+            self.compact()
+        return True
+
+    def compact(self, state=None):
+        """Fold the journal into a fresh snapshot."""
+        if state is not None:
+            self.state = state
+        write_snapshot(self.save_dir, self.name, self.state, self.fmt)
+        self.entries = 0
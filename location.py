@@ -1,5 +1,9 @@
 # location.py
 
+import content
+from events import emit
+from stats import LOCATION, Modifier
+
 class Location:
     def __init__(self, name, description, environment_effect, required_item=None):
         """
@@ -15,54 +19,58 @@ class Location:
         """
         Apply the environmental effect to the player unless they have the required item.
         """
-        if self.required_item and any(item.name == self.required_item for item in player.inventory.items):
-            print(f"{self.required_item} protects {player.name} from {self.name}'s harsh conditions!")
+        if self.required_item and player.inventory.has_item(self.required_item):
+            emit("location_protected", item=self.required_item, name=player.name, location=self.name)
             return  # Effect is countered by the required item
 
         # Apply debuffs/buffs based on environment effect
         for attribute, multiplier in self.environment_effect.items():
             if attribute == 'damage_debuff':
-                player.attack = int(player.attack * multiplier)
-                print(f"{player.name}'s attack power is reduced due to the {self.name} environment.")
+                player.stats.add_modifier(Modifier("location", LOCATION, "attack", multiply=multiplier))
+                emit("location_debuff", name=player.name, location=self.name)
             elif attribute == 'defense_buff':
-                player.defense = int(player.defense * multiplier)
-                print(f"{player.name} feels more resilient in the {self.name}.")
+                player.stats.add_modifier(Modifier("location", LOCATION, "defense", multiply=multiplier))
+                emit("location_buff", name=player.name, location=self.name)
 
     def remove_effect(self, player):
         """
         Revert any effects applied to the player when they leave the location.
         """
-        for attribute, multiplier in self.environment_effect.items():
+        for attribute in self.environment_effect:
             if attribute == 'damage_debuff':
-                player.attack = int(player.attack / multiplier)
+                player.stats.remove_modifier("location", "attack")
             elif attribute == 'defense_buff':
-                player.defense = int(player.defense / multiplier)
+                player.stats.remove_modifier("location", "defense")
+
+
+# Module constants for the standard locations: constant name -> travel key in content/locations.json
+LOCATION_CONSTANTS = {"winter_forest": "Winter Forest", "desert": "Desert", "cave": "Cave"}
+
 
+def _build():
+    """
+    Create the locations from content/locations.json: the `locations` registry (keyed by the
+    name players type to travel) and the LOCATION_CONSTANTS that exist.
+    """
+    locations = {}
+    for entry in content.load("locations"):
+        locations[entry["key"]] = Location(entry["name"], entry["description"], entry["effect"],
+                                           entry.get("required_item"))
+    built = {"locations": locations}
+    for constant, key in LOCATION_CONSTANTS.items():
+        if key in locations:
+            built[constant] = locations[key]
+    return built
 
-# Define specific locations
-winter_forest = Location(
-    name="Winter Forest",
-    description="A cold, snowy forest where the temperature is bitterly low.",
-    environment_effect={'damage_debuff': 0.8},  # 20% reduction in attack power
-    required_item="Winter Coat"
-)
 
-desert = Location(
-    name="Desert",
-    description="A hot, dry desert with relentless sun beating down.",
-    environment_effect={'damage_debuff': 0.9},  # 10% reduction in attack power
-    required_item="Sun Hat"
-)
+_content = content.LazyContent(__name__, _build, ("locations", *LOCATION_CONSTANTS))
+__getattr__ = _content.getattr
 
-cave = Location(
-    name="Dark Cave",
-    description="A dark, damp cave where stealth is easier.",
-    environment_effect={'defense_buff': 1.2}  # 20% increase in defense
-)
 
-# Location registry (could be expanded as needed)
-locations = {
-    "Winter Forest": winter_forest,
-    "Desert": desert,
-    "Cave": cave
-}
+def find_location(name):
+    """Return the location with this travel key or display name (saves store the display name), or None."""
+    registry = _content.get("locations")
+    found = registry.get(name)
+    if found is None:
+        found = next((place for place in registry.values() if place.name == name), None)
+    return found
@@ -0,0 +1,124 @@
+# migrate_saves.py
+
+"""
+Bulk save migration and validation.
+
+Streams every save in a directory through a pool of worker processes. Each worker reads one
+snapshot plus its journal, upgrades it to the current save version, validates it, and
+writes it back as a fresh snapshot with the journal folded in. The snapshot is written to a
+temporary file and renamed into place, so an interrupted run never leaves a half-written
+save. Saves that are already current with an empty journal are not rewritten, and saves
+that fail validation are reported and left exactly as they were.
+
+Run it while no game or server is using the directory:
+    python migrate_saves.py saves --workers 8 --report migration.json
+    python migrate_saves.py saves --check      # validate only, write nothing
+    python migrate_saves.py saves --format binary   # also convert every snapshot to binary
+"""
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import journal
+from save_schema import SAVE_VERSION, save_version, upgrade_save_data, validate_save_data
+
+UPGRADED = "upgraded"
+CURRENT = "current"
+FAILED = "failed"
+
+
+def migrate_one(task):
+    """Upgrade and validate one save. Returns (name, status, problems)."""
+    save_dir, name, write, fmt = task
+    versions = []
+
+    def upgrade(save_data):
+        versions.append(save_version(save_data) if isinstance(save_data, dict) else None)
+        return upgrade_save_data(save_data)
+
+    try:
+        save_data, entries = journal.load(save_dir, name, upgrade)
+        problems = validate_save_data(save_data)
+        if problems:
+            return name, FAILED, problems
+        current_fmt = "binary" if os.path.exists(journal.snapshot_path(save_dir, name, "binary")) else "json"
+        fmt = fmt or current_fmt
+        if versions[0] == SAVE_VERSION and not entries and fmt == current_fmt:
+            return name, CURRENT, []
+        if write:
+            journal.write_snapshot(save_dir, name, save_data, fmt)
+        return name, UPGRADED, []
+    except Exception as e:  # One unreadable save must not stop the rest of the run
+        return name, FAILED, [f"{type(e).__name__}: {e}"]
+
+
+def migrate(save_dir, workers=None, write=True, chunksize=64, fmt=None):
+    """
+    Migrate (or with write=False, only check) every save in `save_dir`, rewriting snapshots in
+    `fmt` ("json" or "binary"; None keeps each save's format). Returns a report dict.
+    """
+    started = time.perf_counter()
+    counts = {UPGRADED: 0, CURRENT: 0, FAILED: 0}
+    failures = {}
+    tasks = ((save_dir, name, write, fmt) for name in journal.save_names(save_dir))
+
+    if workers == 1:
+        results = map(migrate_one, tasks)  # In-process; handy for debugging a single bad save
+        pool = None
+    else:
+        pool = Pool(workers)
+        results = pool.imap_unordered(migrate_one, tasks, chunksize)
+    try:
+        for name, status, problems in results:
+            counts[status] += 1
+            if problems:
+                failures[name] = problems
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    seconds = time.perf_counter() - started
+    total = sum(counts.values())
+    return {
+        "save_dir": save_dir,
+        "version": SAVE_VERSION,
+        "format": fmt,
+        "written": write,
+        "files": total,
+        **counts,
+        "seconds": round(seconds, 3),
+        "files_per_second": round(total / seconds, 1) if seconds else 0.0,
+        "failures": dict(sorted(failures.items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade and validate every save in a directory.")
+    parser.add_argument("save_dir", nargs="?", default="saves")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=64, help="Saves handed to a worker at a time")
+    parser.add_argument("--check", action="store_true", help="Validate only; do not rewrite any save")
+    parser.add_argument("--format", choices=journal.SNAPSHOT_EXTENSIONS, help="Convert snapshots to this format")
+    parser.add_argument("--report", help="Also write the full report, with every failure, to this JSON file")
+    args = parser.parse_args()
+
+    report = migrate(args.save_dir, args.workers, write=not args.check, chunksize=args.chunksize, fmt=args.format)
+    verb = "need upgrading" if args.check else "upgraded"
+    print(f"{report['files']} saves in {report['seconds']}s ({report['files_per_second']} saves/s): "
+          f"{report[UPGRADED]} {verb}, {report[CURRENT]} already at version {SAVE_VERSION}, "
+          f"{report[FAILED]} failed")
+    for name, problems in list(report["failures"].items())[:20]:
+        print(f"  {name}: {'; '.join(problems)}")
+    if len(report["failures"]) > 20:
+        print(f"  ... and {len(report['failures']) - 20} more")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
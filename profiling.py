@@ -0,0 +1,157 @@
+# profiling.py
+
+"""
+Profiling mode for long play sessions.
+
+When enabled, every main-menu command and every combat turn is timed and counted. Time
+spent waiting for the player to type is left out, so the numbers show how long the game
+itself took. Latencies go into power-of-two histograms, which keeps recording cheap, and
+the report is written to a JSON file when the process exits. Optionally each command also
+runs under cProfile, with one .prof file per command. That needs a single game: cProfile
+allows one enabled profiler at a time, so the server refuses ADVENTURE_CPROFILE.
+
+Enable it with an environment variable or with game.py's --profile flag:
+    ADVENTURE_PROFILE=profile.json python game.py
+    ADVENTURE_PROFILE=1 python server.py
+    python game.py --profile profile.json --cprofile
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import time
+
+DEFAULT_PATH = "adventure_profile.json"
+
+active = None  # The running Profiler, or None when profiling is off
+
+
+class Histogram:
+    """Latency counts in power-of-two microsecond buckets: bucket k holds [2**(k-1), 2**k) us."""
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = []
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int(seconds * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def percentile(self, fraction):
+        """Upper bound, in microseconds, of the bucket holding this fraction of the samples."""
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return 2 ** bucket
+        return 2 ** len(self.buckets)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1e3, 3),
+            "mean_us": round(self.total / self.count * 1e6, 1) if self.count else 0.0,
+            "p50_us_max": self.percentile(0.50),
+            "p90_us_max": self.percentile(0.90),
+            "p99_us_max": self.percentile(0.99),
+            "max_us": round(self.max * 1e6, 1),
+            "histogram_us": {f"<{2 ** bucket}": count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+class ProfiledIO:
+    """Wraps a game I/O object and adds up the time spent waiting for input."""
+    def __init__(self, io):
+        self.io = io
+        self.waiting = 0.0
+
+    async def ask(self, prompt):
+        started = time.perf_counter()
+        try:
+            return await self.io.ask(prompt)
+        finally:
+            self.waiting += time.perf_counter() - started
+
+    def say(self, text=""):
+        self.io.say(text)
+
+
+class Profiler:
+    def __init__(self, path=DEFAULT_PATH, cprofile=False):
+        self.path = path
+        self.histograms = {}  # Command or combat turn label -> Histogram
+        self.profiles = {} if cprofile else None  # Command -> cProfile.Profile
+        self.started = time.time()
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def clock(self, io):
+        """Seconds of game time: wall-clock time minus the time `io` spent waiting for input."""
+        return time.perf_counter() - getattr(io, "waiting", 0.0)
+
+    def wrap_command(self, name, handler):
+        """Wrap a command handler (async, taking the session) so each call is timed."""
+        async def profiled(session):
+            profile = None
+            if self.profiles is not None:
+                profile = self.profiles.get(name)
+                if profile is None:
+                    profile = self.profiles[name] = cProfile.Profile()
+                profile.enable()
+            started = self.clock(session.io)
+            try:
+                await handler(session)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                self.record(name, self.clock(session.io) - started)
+        return profiled
+
+    def wrap_commands(self, commands):
+        return {name: self.wrap_command(name, handler) for name, handler in commands.items()}
+
+    def report(self):
+        return {
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "seconds": round(time.time() - self.started, 3),
+            "timings": {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def dump(self):
+        """Write the report, plus one .prof file per command when cProfile is on."""
+        with open(self.path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        if self.profiles:
+            stem = os.path.splitext(self.path)[0]
+            for name, profile in self.profiles.items():
+                profile.dump_stats(f"{stem}.{name.replace(' ', '_')}.prof")
+
+
+def enable(path=None, cprofile=False):
+    """Turn profiling on for the rest of the process; the report is written at exit."""
+    global active
+    if active is None:
+        active = Profiler(path or DEFAULT_PATH, cprofile)
+        atexit.register(active.dump)
+    return active
+
+
+_env_path = os.environ.get("ADVENTURE_PROFILE", "")
+if _env_path not in ("", "0"):
+    enable(DEFAULT_PATH if _env_path == "1" else _env_path,
+           cprofile=os.environ.get("ADVENTURE_CPROFILE", "") not in ("", "0"))
@@ -0,0 +1,57 @@
+# progression.py
+
+"""
+Experience curve and level progression.
+
+Going from level L to L + 1 takes 50 * 1.5 ** (L - 1) experience, rounded up to whole
+points. The running totals are precomputed once, so any amount of experience is turned
+into levels with a binary search (O(log levels)) instead of one level-up at a time, and a
+character's stats at any level follow directly from the per-level gains below.
+"""
+
+import math
+from bisect import bisect_right
+
+XP_BASE = 50
+XP_GROWTH = 1.5
+MAX_LEVEL = 1000  # Experience past the last level keeps accumulating but grants no more levels
+
+# Gains per level
+LEVEL_HP = 10
+LEVEL_ATTACK = 2
+LEVEL_DEFENSE = 1
+
+# REQUIRED_EXP[level] is the experience needed to go from `level` to the next one; there is
+# no next level after MAX_LEVEL (index 0 is unused)
+REQUIRED_EXP = [0] + [math.ceil(XP_BASE * XP_GROWTH ** (level - 1)) for level in range(1, MAX_LEVEL)] + [math.inf]
+
+# TOTAL_EXP[i] is the experience needed to go from level 1 to level i + 1
+TOTAL_EXP = [0]
+for _required in REQUIRED_EXP[1:MAX_LEVEL]:
+    TOTAL_EXP.append(TOTAL_EXP[-1] + _required)
+del _required
+
+
+def required_exp(level):
+    """Experience needed to go from `level` to the next one (infinite at MAX_LEVEL)."""
+    return REQUIRED_EXP[level]
+
+
+def level_for_total(total_exp):
+    """The level reached with `total_exp` experience earned since level 1."""
+    return min(bisect_right(TOTAL_EXP, total_exp), MAX_LEVEL)
+
+
+def apply_experience(level, exp, amount):
+    """
+    Add `amount` experience to a character at `level` holding `exp` towards the next level.
+    Returns (new level, experience held towards the level after that).
+    """
+    total = TOTAL_EXP[level - 1] + exp + amount
+    new_level = max(level, level_for_total(total))
+    return new_level, total - TOTAL_EXP[new_level - 1]
+
+
+def level_gains(levels):
+    """Stat increases for gaining `levels` levels: (hp, attack, defense)."""
+    return LEVEL_HP * levels, LEVEL_ATTACK * levels, LEVEL_DEFENSE * levels
@@ -0,0 +1,109 @@
+# rng.py
+
+"""
+Seedable random number streams.
+
+An RngService hands out independent RandomStreams, one per character or encounter, each
+derived from the service seed. Streams draw their numbers in blocks (a NumPy Generator
+when NumPy is installed, otherwise random.Random) and serve rolls from that buffer, so the
+per-roll cost inside combat loops is an array lookup.
+
+Set ADVENTURE_SEED to make a whole game or simulation reproducible. Seeded runs repeat
+exactly for a given backend; NumPy and the fallback produce different sequences.
+"""
+
+import hashlib
+import os
+import random
+from array import array
+
+BLOCK_SIZE = 512  # Values drawn per refill
+
+_np = False  # The numpy module, or None without NumPy; False until first needed
+
+
+def _numpy():
+    """NumPy if it is installed, else None. Imported on the first refill, not at start-up."""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:  # Streams fall back to random.Random without NumPy
+            _np = None
+    return _np
+
+
+class RandomStream:
+    """One independent stream of random numbers, drawn from its generator in blocks."""
+    __slots__ = ("seed", "block_size", "_generator", "_next")
+
+    def __init__(self, seed, block_size=BLOCK_SIZE):
+        self.seed = seed
+        self.block_size = block_size
+        self._generator = None  # Created on first use; many streams never roll at all
+        self._next = iter(()).__next__  # Serves the current block; raises StopIteration when it runs out
+
+    def _refill(self):
+        np = _numpy()
+        if self._generator is None:
+            self._generator = np.random.default_rng(self.seed) if np else random.Random(self.seed)
+        if np:
+            block = array("d", self._generator.random(self.block_size).tobytes())
+        else:
+            draw = self._generator.random
+            block = array("d", [draw() for _ in range(self.block_size)])
+        self._next = iter(block).__next__
+
+    def random(self):
+        """Float in [0, 1)."""
+        try:
+            return self._next()
+        except StopIteration:
+            self._refill()
+            return self._next()
+
+    def randint(self, a, b):
+        """Integer in [a, b], inclusive like random.randint."""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.random() * len(seq))]
+
+
+class RngService:
+    """Hands out independently seeded streams derived from one master seed."""
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self._count = 0
+        self._shared = {}  # Key -> stream handed out by shared()
+
+    def reseed(self, seed):
+        """Restart the service from `seed`; streams handed out afterwards repeat a seeded run."""
+        self.seed = seed
+        self._count = 0
+        self._shared.clear()  # Shared streams restart from the new seed too
+
+    def stream(self, key=None):
+        """
+        Return a new stream. Streams with the same key always get the same seed; without a
+        key, streams are numbered in the order they are created.
+        """
+        if key is None:
+            key = f"stream-{self._count}"
+            self._count += 1
+        digest = hashlib.blake2b(f"{self.seed}:{key}".encode(), digest_size=8).digest()
+        return RandomStream(int.from_bytes(digest, "little"))
+
+    def shared(self, key):
+        """The one stream for `key` that every caller draws from, until the next reseed()."""
+        stream = self._shared.get(key)
+        if stream is None:
+            stream = self._shared[key] = self.stream(key)
+        return stream
+
+
+_seed = os.environ.get("ADVENTURE_SEED")
+rng_service = RngService(int(_seed) if _seed else None)  # Service used when nothing else is injected
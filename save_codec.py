@@ -0,0 +1,306 @@
+# save_codec.py
+
+"""
+Binary save format.
+
+A compact alternative to the JSON snapshot, stored as saves/<name>.sav. The file is laid out as:
+
+    header   fixed struct: magic, codec version, save version, section count, and the core
+             stats (hp, max_hp, attack, defense, level, gold)
+    offsets  one u32 per section plus the end of the file, so any section can be found
+             without decoding the ones before it
+    STRINGS  every string in the save, each stored once
+    IDENTITY name, class and location as string references, then exp
+    SKILLS   skill names as string references
+    ITEMS    inventory: item id reference and quantity, plus the full entry for items that
+             are not in the catalog
+    EXTRA    JSON for any field this layout has no place for (normally empty)
+
+Integers after the header are varints (zigzag encoded where they may be negative), and string
+references are varint indexes into STRINGS. SaveView decodes sections only when they are
+asked for, so listing saves reads the header and a few small sections and never touches the
+inventory.
+"""
+
+import json
+import struct
+
+MAGIC = b"RSAV"
+CODEC_VERSION = 1
+
+# magic, codec version, save version, section count, hp, max_hp, attack, defense, level, gold
+HEADER = struct.Struct("<4sBBHiiiiHQ")
+OFFSET = struct.Struct("<I")
+
+STRINGS, IDENTITY, SKILLS, ITEMS, EXTRA = range(5)
+SECTION_COUNT = 5
+
+HEADER_FIELDS = ("hp", "max_hp", "attack", "defense", "level", "gold")
+ENCODED_FIELDS = {"version", "name", "class", "location", "exp", "skills", "inventory", *HEADER_FIELDS}
+
+_CATALOG_ITEM = 0  # Item kinds in the ITEMS section
+_CUSTOM_ITEM = 1
+
+
+class SaveFormatError(ValueError):
+    """The bytes are not a save this codec can read."""
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_signed(out, value):
+    _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)  # Zigzag: small negatives stay small
+
+
+def _checked(value, field, signed=False):
+    """`value` if it can be stored as a varint; raises SaveFormatError otherwise."""
+    if isinstance(value, bool) or not isinstance(value, int) or (value < 0 and not signed):
+        raise SaveFormatError(f"{field} should be {'an' if signed else 'a non-negative'} int, not {value!r}")
+    return value
+
+
+def _read_varint(data, pos):
+    try:
+        byte = data[pos]
+    except IndexError:
+        raise SaveFormatError("truncated varint") from None
+    if byte < 0x80:
+        return byte, pos + 1  # Most values (references, quantities) fit in one byte
+    result = shift = 0
+    while True:
+        try:
+            byte = data[pos]
+        except IndexError:
+            raise SaveFormatError("truncated varint") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _read_signed(data, pos):
+    value, pos = _read_varint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+
+    def ref(self, text):
+        ref = self.index.get(text)
+        if ref is None:
+            ref = self.index[text] = len(self.index)
+        return ref
+
+    def encode(self):
+        out = bytearray()
+        _write_varint(out, len(self.index))
+        for text in self.index:  # Dicts keep insertion order, which matches the references
+            raw = text.encode("utf-8")
+            _write_varint(out, len(raw))
+            out += raw
+        return out
+
+
+def encode(save_data):
+    """
+    Encode a current-version save dict. Raises SaveFormatError if a core stat is out of range
+    or a number the layout stores as an int (exp, prices, quantities) is not one.
+    """
+    strings = _StringTable()
+
+    identity = bytearray()
+    _write_varint(identity, strings.ref(save_data["name"]))
+    _write_varint(identity, strings.ref(save_data["class"]))
+    location = save_data.get("location")
+    _write_varint(identity, 0 if location is None else strings.ref(location) + 1)  # 0 means no location
+    _write_signed(identity, _checked(save_data["exp"], "exp", signed=True))
+
+    skills = bytearray()
+    _write_varint(skills, len(save_data["skills"]))
+    for skill in save_data["skills"]:
+        _write_varint(skills, strings.ref(skill))
+
+    items = bytearray()
+    _write_varint(items, len(save_data["inventory"]))
+    for item_id, entry in save_data["inventory"].items():
+        _write_varint(items, strings.ref(item_id))
+        if isinstance(entry, dict):
+            _write_varint(items, _CUSTOM_ITEM)
+            for field in ("name", "description", "type"):
+                _write_varint(items, strings.ref(entry[field]))
+            _write_signed(items, _checked(entry["price"], f"item {item_id}: price", signed=True))
+            _write_varint(items, _checked(entry["quantity"], f"item {item_id}: quantity"))
+        else:
+            _write_varint(items, _CATALOG_ITEM)
+            _write_varint(items, _checked(entry, f"item {item_id}: quantity"))
+
+    extra = {key: value for key, value in save_data.items() if key not in ENCODED_FIELDS}
+    sections = [strings.encode(), identity, skills, items,
+                json.dumps(extra, separators=(",", ":")).encode("utf-8") if extra else b""]
+
+    try:
+        out = bytearray(HEADER.pack(MAGIC, CODEC_VERSION, save_data.get("version", 0), SECTION_COUNT,
+                                    *(save_data[field] for field in HEADER_FIELDS)))
+    except struct.error as e:
+        raise SaveFormatError(f"a core stat does not fit the header: {e}") from None
+    offset = HEADER.size + OFFSET.size * (SECTION_COUNT + 1)
+    for section in sections:
+        out += OFFSET.pack(offset)
+        offset += len(section)
+    out += OFFSET.pack(offset)
+    for section in sections:
+        out += section
+    return bytes(out)
+
+
+def read_header(data):
+    """Decode only the fixed header: the core stats plus "version"."""
+    if len(data) < HEADER.size:
+        raise SaveFormatError("file is shorter than the header")
+    magic, codec_version, save_version, _, *stats = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("not a binary save")
+    if codec_version != CODEC_VERSION:
+        raise SaveFormatError(f"codec version {codec_version} is not supported")
+    header = dict(zip(HEADER_FIELDS, stats))
+    header["version"] = save_version
+    return header
+
+
+class SaveView:
+    """Read-only view of an encoded save that decodes each section the first time it is needed."""
+    def __init__(self, data):
+        self.data = data
+        self.header = read_header(data)
+        count = HEADER.unpack_from(data)[3]
+        if count < SECTION_COUNT:
+            raise SaveFormatError(f"expected {SECTION_COUNT} sections, found {count}")
+        end = HEADER.size + OFFSET.size * (count + 1)
+        if len(data) < end:
+            raise SaveFormatError("truncated offset table")
+        self.offsets = [offset for (offset,) in OFFSET.iter_unpack(data[HEADER.size:end])]
+        self._string_pos, self._strings_end = self._bounds(STRINGS)
+        self._string_count = 0
+        self._decoded = []  # Strings decoded so far, in table order
+        self._identity = None
+
+    def _bounds(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if not start <= end <= len(self.data):
+            raise SaveFormatError("truncated section")
+        return start, end
+
+    def _strings(self, count):
+        """
+        The first `count` strings of the table (or all of them), decoding only as far as needed.
+        Identity and skill strings come first, so a summary never decodes item strings.
+        """
+        strings = self._decoded
+        if len(strings) < count and self._string_pos < self._strings_end:
+            data, pos = self.data, self._string_pos
+            if not strings:
+                self._string_count, pos = _read_varint(data, pos)
+            for _ in range(min(count, self._string_count) - len(strings)):
+                length, pos = _read_varint(data, pos)
+                strings.append(data[pos:pos + length].decode("utf-8"))
+                pos += length
+            self._string_pos = pos
+        return strings
+
+    def _identity_fields(self):
+        if self._identity is None:
+            data = self.data
+            pos, _ = self._bounds(IDENTITY)
+            name, pos = _read_varint(data, pos)
+            char_class, pos = _read_varint(data, pos)
+            location, pos = _read_varint(data, pos)
+            exp, pos = _read_signed(data, pos)
+            strings = self._strings(max(name, char_class, location - 1) + 1)
+            try:
+                self._identity = {"name": strings[name], "class": strings[char_class],
+                                  "location": strings[location - 1] if location else None, "exp": exp}
+            except IndexError:
+                raise SaveFormatError("string reference out of range") from None
+        return self._identity
+
+    def skills(self):
+        data = self.data
+        pos, _ = self._bounds(SKILLS)
+        count, pos = _read_varint(data, pos)
+        refs = []
+        for _ in range(count):
+            ref, pos = _read_varint(data, pos)
+            refs.append(ref)
+        strings = self._strings(max(refs) + 1 if refs else 0)
+        try:
+            return [strings[ref] for ref in refs]
+        except IndexError:
+            raise SaveFormatError("string reference out of range") from None
+
+    def inventory(self):
+        data, strings = self.data, self._strings(len(self.data))  # Every string; there are fewer than bytes
+        pos, _ = self._bounds(ITEMS)
+        count, pos = _read_varint(data, pos)
+        inventory = {}
+        try:
+            for _ in range(count):
+                item_id, pos = _read_varint(data, pos)
+                kind, pos = _read_varint(data, pos)
+                if kind == _CUSTOM_ITEM:
+                    name, pos = _read_varint(data, pos)
+                    description, pos = _read_varint(data, pos)
+                    item_type, pos = _read_varint(data, pos)
+                    price, pos = _read_signed(data, pos)
+                    quantity, pos = _read_varint(data, pos)
+                    entry = {"name": strings[name], "description": strings[description],
+                             "type": strings[item_type], "price": price, "quantity": quantity}
+                else:
+                    entry, pos = _read_varint(data, pos)
+                inventory[strings[item_id]] = entry
+        except IndexError:
+            raise SaveFormatError("string reference out of range") from None
+        return inventory
+
+    def extra(self):
+        data = self.data
+        start, end = self._bounds(EXTRA)
+        return json.loads(data[start:end]) if end > start else {}
+
+    def summary(self, fields):
+        """The requested top-level fields, decoding only the sections they live in."""
+        result = {}
+        for field in fields:
+            if field in self.header:
+                result[field] = self.header[field]
+            elif field in ("name", "class", "location", "exp"):
+                result[field] = self._identity_fields()[field]
+            elif field == "skills":
+                result[field] = self.skills()
+            elif field == "inventory":
+                result[field] = self.inventory()
+            else:
+                result[field] = self.extra().get(field)
+        return result
+
+    def to_dict(self):
+        """Decode the whole save."""
+        save_data = {"version": self.header["version"], **self._identity_fields()}
+        for field in HEADER_FIELDS:
+            save_data[field] = self.header[field]
+        save_data["skills"] = self.skills()
+        save_data["inventory"] = self.inventory()
+        save_data.update(self.extra())
+        return save_data
+
+
+def decode(data):
+    """Decode a whole save into the same dict a JSON snapshot holds."""
+    return SaveView(data).to_dict()
@@ -0,0 +1,181 @@
+# save_db.py
+
+"""
+SQLite save store.
+
+An optional backend for save_game/load_game that keeps every character in one database
+(saves/saves.db) instead of a JSON file each. The full save is stored as JSON, and the
+fields people ask about (class, level, gold, location, ...) are also kept in indexed
+columns, so leaderboards and admin queries do not have to read every save. The database
+runs in WAL mode, so several game processes can write while others read.
+
+Select it with ADVENTURE_SAVE_BACKEND=sqlite. The same module works as an admin tool:
+    python save_db.py import saves
+    python save_db.py top --by level --limit 100
+    python save_db.py find --class Paladin --location Desert
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+import journal
+from save_schema import upgrade_save_data
+
+DB_FILE = "saves.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    name     TEXT PRIMARY KEY,
+    class    TEXT,
+    level    INTEGER,
+    exp      INTEGER,
+    hp       INTEGER,
+    max_hp   INTEGER,
+    attack   INTEGER,
+    defense  INTEGER,
+    gold     INTEGER,
+    location TEXT,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS saves_class_location ON saves (class, location);
+CREATE INDEX IF NOT EXISTS saves_level ON saves (level DESC);
+CREATE INDEX IF NOT EXISTS saves_gold ON saves (gold DESC);
+CREATE INDEX IF NOT EXISTS saves_location ON saves (location);
+"""
+
+UPSERT = """
+INSERT INTO saves (name, class, level, exp, hp, max_hp, attack, defense, gold, location, data)
+VALUES (:name, :class, :level, :exp, :hp, :max_hp, :attack, :defense, :gold, :location, :data)
+ON CONFLICT (name) DO UPDATE SET
+    class = excluded.class, level = excluded.level, exp = excluded.exp, hp = excluded.hp,
+    max_hp = excluded.max_hp, attack = excluded.attack, defense = excluded.defense,
+    gold = excluded.gold, location = excluded.location, data = excluded.data
+"""
+
+# Summary columns returned by queries, in the same layout as SaveIndex summaries
+SUMMARY_COLUMNS = ("name", "class", "level", "hp", "max_hp", "attack", "defense", "exp", "gold", "location")
+RANKINGS = ("level", "gold", "exp")  # Columns a leaderboard can be ordered by
+
+
+def _row(save_data):
+    """Bind parameters for one save."""
+    row = {column: save_data.get(column) for column in SUMMARY_COLUMNS}
+    row["data"] = json.dumps(save_data, separators=(",", ":"))
+    return row
+
+
+class SaveDatabase:
+    def __init__(self, save_dir):
+        os.makedirs(save_dir, exist_ok=True)
+        self.path = os.path.join(save_dir, DB_FILE)
+        self.connection = sqlite3.connect(self.path, timeout=30)  # Waits out other writers
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; commits skip an fsync
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def save(self, save_data):
+        with self.connection:
+            self.connection.execute(UPSERT, _row(save_data))
+
+    def save_many(self, saves):
+        """Insert or update many saves in one transaction with a single prepared statement."""
+        with self.connection:
+            self.connection.executemany(UPSERT, (_row(save_data) for save_data in saves))
+
+    def load(self, name):
+        """The save dict for `name`, or None if there is no such save."""
+        row = self.connection.execute("SELECT data FROM saves WHERE name = ?", (name,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def delete(self, name):
+        with self.connection:
+            self.connection.execute("DELETE FROM saves WHERE name = ?", (name,))
+
+    def _summaries(self, where="", params=(), order="name", limit=None):
+        query = f"SELECT {', '.join(SUMMARY_COLUMNS)}, data FROM saves {where} ORDER BY {order}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (*params, limit)
+        summaries = []
+        for row in self.connection.execute(query, params):
+            summary = {column: row[column] for column in SUMMARY_COLUMNS}
+            summary["skills"] = json.loads(row["data"]).get("skills", [])
+            summaries.append(summary)
+        return summaries
+
+    def summaries(self):
+        """Summaries of every save, sorted by name."""
+        return self._summaries()
+
+    def top(self, by="level", limit=100):
+        """Leaderboard: the `limit` best saves by level, gold or exp."""
+        if by not in RANKINGS:
+            raise ValueError(f"Cannot rank by {by!r}; choose one of {', '.join(RANKINGS)}")
+        return self._summaries(order=f"{by} DESC, name", limit=limit)
+
+    def find(self, char_class=None, location=None, min_level=None, limit=None):
+        """Saves matching every filter given, e.g. all Paladins in the Desert."""
+        conditions, params = [], []
+        if char_class is not None:
+            conditions.append("class = ?")
+            params.append(char_class)
+        if location is not None:
+            conditions.append("location = ?")
+            params.append(location)
+        if min_level is not None:
+            conditions.append("level >= ?")
+            params.append(min_level)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self._summaries(where, tuple(params), limit=limit)
+
+
+def import_directory(database, save_dir, upgrade=None):
+    """Copy every JSON save (snapshot plus journal) in `save_dir` into the database. Returns the count."""
+    saves = [journal.load(save_dir, name, upgrade)[0] for name in sorted(journal.save_names(save_dir))]
+    database.save_many(saves)
+    return len(saves)
+
+
+def _print_summaries(summaries):
+    print(f"{'Name':<16} {'Class':<10} {'Level':>5} {'Gold':>7}  Location")
+    for summary in summaries:
+        print(f"{summary['name']:<16} {summary['class']:<10} {summary['level']:>5} {summary['gold']:>7}  "
+              f"{summary['location'] or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage and query the SQLite save store.")
+    parser.add_argument("--dir", default="saves", help="Directory holding saves.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Copy JSON saves into the database")
+    import_parser.add_argument("source", help="Directory of JSON saves")
+    top_parser = commands.add_parser("top", help="Show a leaderboard")
+    top_parser.add_argument("--by", choices=RANKINGS, default="level")
+    top_parser.add_argument("--limit", type=int, default=100)
+    find_parser = commands.add_parser("find", help="List saves matching filters")
+    find_parser.add_argument("--class", dest="char_class")
+    find_parser.add_argument("--location")
+    find_parser.add_argument("--min-level", type=int)
+    args = parser.parse_args()
+
+    database = SaveDatabase(args.dir)
+    try:
+        if args.command == "import":
+            count = import_directory(database, args.source, upgrade_save_data)
+            print(f"Imported {count} saves into {database.path}")
+        elif args.command == "top":
+            _print_summaries(database.top(args.by, args.limit))
+        else:
+            _print_summaries(database.find(args.char_class, args.location, args.min_level))
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
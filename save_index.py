@@ -0,0 +1,108 @@
+# save_index.py
+
+"""
+Persistent summary index for the saves directory.
+
+Keeps one small summary per save (name, class, level, HP, gold, location, ...) in
+saves/.summary_index together with the mtime and size of the files it was built from.
+Listing saves only has to stat the directory; a save is re-parsed only when its snapshot
+or journal has changed since it was last indexed. Binary snapshots with an empty journal
+are summarised from their header and small sections, without decoding the inventory.
+"""
+
+import json
+import os
+
+import journal
+import save_codec
+from save_schema import SAVE_VERSION
+
+INDEX_FILE = ".summary_index"
+SUMMARY_FIELDS = ("name", "class", "level", "hp", "max_hp", "attack", "defense", "exp", "gold", "location", "skills")
+
+
+def _signature(entry):
+    stat = entry.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _binary_summary(path):
+    """Summary straight from a binary snapshot, or None if it needs a full load and upgrade."""
+    with open(path, "rb") as f:
+        view = save_codec.SaveView(f.read())
+    if view.header["version"] != SAVE_VERSION:
+        return None
+    return view.summary(SUMMARY_FIELDS)
+
+
+class SaveIndex:
+    def __init__(self, save_dir, upgrade=None):
+        self.save_dir = save_dir
+        self.upgrade = upgrade  # Passed to journal.load for saves in an older layout
+        self.path = os.path.join(save_dir, INDEX_FILE)
+        self.entries = {}  # Save name -> {"snapshot": sig, "journal": sig or None, "summary": dict or None}
+        self._loaded = False
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}  # Missing or damaged index; it is rebuilt from the saves
+        self._loaded = True
+
+    def _write(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def refresh(self):
+        """Bring the index up to date with the directory, re-parsing only new or changed saves."""
+        if not self._loaded:
+            self._load()
+
+        snapshots = {}
+        formats = {}  # Save name -> snapshot format
+        journals = {}
+        with os.scandir(self.save_dir) as it:
+            for entry in it:
+                fmt = journal.snapshot_format(entry.name)
+                if fmt:
+                    name = entry.name[:-len(journal.SNAPSHOT_EXTENSIONS[fmt])]
+                    if fmt == "binary" or name not in formats:  # Loading prefers the binary snapshot
+                        snapshots[name] = _signature(entry)
+                        formats[name] = fmt
+                elif entry.name.endswith(".journal") and not entry.name.startswith("."):
+                    journals[entry.name[:-len(".journal")]] = _signature(entry)
+
+        changed = False
+        for name in list(self.entries):
+            if name not in snapshots:
+                del self.entries[name]  # Save was deleted
+                changed = True
+
+        for name, snapshot_sig in snapshots.items():
+            journal_sig = journals.get(name)
+            cached = self.entries.get(name)
+            if cached and cached["snapshot"] == snapshot_sig and cached["journal"] == journal_sig:
+                continue
+            try:
+                summary = None
+                if formats[name] == "binary" and (journal_sig is None or journal_sig[1] == 0):
+                    summary = _binary_summary(journal.snapshot_path(self.save_dir, name, "binary"))
+                if summary is None:
+                    save_data, _ = journal.load(self.save_dir, name, self.upgrade)
+                    summary = {field: save_data.get(field) for field in SUMMARY_FIELDS}
+            except (OSError, ValueError):
+                summary = None  # Unreadable save; skipped until the file changes
+            self.entries[name] = {"snapshot": snapshot_sig, "journal": journal_sig, "summary": summary}
+            changed = True
+
+        if changed:
+            self._write()
+
+    def summaries(self):
+        """Return the summaries of every readable save, sorted by name."""
+        return [self.entries[name]["summary"] for name in sorted(self.entries)
+                if self.entries[name]["summary"] is not None]
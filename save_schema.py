@@ -0,0 +1,165 @@
+# save_schema.py
+
+"""
+Versioned save layout.
+
+Every save carries a "version" field. Saves written before it existed count as version 0
+(the inventory is a list with one full entry per copy) or version 1 (the inventory maps
+item id -> quantity), depending on the shape of their inventory. MIGRATIONS[v] turns a
+version v save into version v + 1, so upgrade_save_data() brings a save of any age up to
+SAVE_VERSION one step at a time. validate_save_data() lists everything about a save that
+would make loading it fail or silently drop data.
+
+Older saves can hold, besides missing fields:
+    - an inventory list with one entry per copy, or entries without a type or quantity
+    - a negative float exp, from the old level-up that reset exp to 0 and then subtracted a
+      float requirement
+"""
+
+import content
+import location
+from catalog import find_item, get_items
+from progression import level_gains
+
+SAVE_VERSION = 2
+
+# Field -> accepted type(s) for a current save
+FIELDS = {
+    "version": int,
+    "name": str,
+    "class": str,
+    "hp": int,
+    "max_hp": int,
+    "attack": int,
+    "defense": int,
+    "level": int,
+    "exp": int,
+    "skills": list,
+    "inventory": dict,
+    "gold": int,
+    "location": (str, type(None)),
+}
+
+ITEM_FIELDS = {"name": str, "description": str, "type": str, "price": int, "quantity": int}
+
+
+def save_version(save_data):
+    """The layout version of a save, inferred for saves written before versions were recorded."""
+    if "version" in save_data:
+        return save_data["version"]
+    return 0 if isinstance(save_data.get("inventory"), list) else 1
+
+
+def _v0_to_v1(save_data):
+    """Convert an inventory that lists full item entries into id -> quantity form."""
+    inventory = {}
+    for item_data in save_data.get("inventory", []):
+        quantity = item_data.get("quantity", 1)  # Older saves list one entry per copy
+        item = find_item(item_data["name"])
+        if item:
+            inventory[item.item_id] = inventory.get(item.item_id, 0) + quantity
+        else:
+            item_id = item_data["name"].lower().replace(" ", "_")
+            entry = inventory.setdefault(item_id, {
+                "name": item_data["name"],
+                "description": item_data.get("description", ""),
+                "type": item_data.get("type", "misc"),  # Default to "misc" if 'type' is missing
+                "price": item_data.get("price", 0),
+                "quantity": 0
+            })
+            entry["quantity"] += quantity
+    save_data["inventory"] = inventory
+    return save_data
+
+
+def _v1_to_v2(save_data):
+    """
+    Fill in fields older saves may lack, with the values a new character of that class would
+    have, and turn a float exp into a non-negative int.
+    """
+    level = save_data.setdefault("level", 1)
+    exp = save_data.setdefault("exp", 0)
+    if isinstance(exp, float):
+        save_data["exp"] = max(0, int(exp))
+    save_data.setdefault("gold", 100)
+    save_data.setdefault("location", None)
+    save_data.setdefault("inventory", {})
+
+    profile = content.load("classes").get(save_data.get("class"), {})
+    hp, attack, defense = level_gains(level - 1) if isinstance(level, int) else (0, 0, 0)
+    save_data.setdefault("max_hp", 100 + hp)  # Class HP bonuses change starting HP, not the cap
+    save_data.setdefault("hp", 100 + profile.get("hp", 0) + hp)
+    save_data.setdefault("attack", 10 + profile.get("attack", 0) + attack)
+    save_data.setdefault("defense", 5 + profile.get("defense", 0) + defense)
+    save_data.setdefault("skills", list(profile.get("skills", ())))
+
+    for entry in save_data["inventory"].values():
+        if isinstance(entry, dict):
+            entry.setdefault("description", "")
+            entry.setdefault("type", "misc")
+            entry.setdefault("price", 0)
+            entry.setdefault("quantity", 1)
+    return save_data
+
+
+MIGRATIONS = [_v0_to_v1, _v1_to_v2]  # MIGRATIONS[v] upgrades a version v save to v + 1
+
+
+def upgrade_save_data(save_data):
+    """Bring a save dict up to SAVE_VERSION. Saves from a newer version are returned unchanged."""
+    version = save_version(save_data)
+    if not isinstance(version, int) or version >= SAVE_VERSION:
+        return save_data
+    for migrate in MIGRATIONS[max(version, 0):]:
+        save_data = migrate(save_data)
+    save_data["version"] = SAVE_VERSION
+    return save_data
+
+
+def _type_error(field, value, expected):
+    names = " or ".join(t.__name__ for t in expected) if isinstance(expected, tuple) else expected.__name__
+    return f"{field} should be {names}, not {type(value).__name__}"
+
+
+def validate_save_data(save_data):
+    """Return a list of problems with a current-version save; an empty list means it loads cleanly."""
+    if not isinstance(save_data, dict):
+        return [f"save should be an object, not {type(save_data).__name__}"]
+
+    problems = []
+    for field, expected in FIELDS.items():
+        if field not in save_data:
+            problems.append(f"missing {field}")
+        elif isinstance(save_data[field], bool) or not isinstance(save_data[field], expected):
+            problems.append(_type_error(field, save_data[field], expected))
+    if problems:
+        return problems  # The checks below rely on the field types
+
+    if save_data["version"] != SAVE_VERSION:
+        problems.append(f"version {save_data['version']}, expected {SAVE_VERSION}")
+    if not save_data["name"]:
+        problems.append("empty name")
+    if save_data["level"] < 1:
+        problems.append(f"level {save_data['level']} is below 1")
+    for field in ("exp", "gold"):
+        if save_data[field] < 0:
+            problems.append(f"negative {field}")
+    if not all(isinstance(skill, str) for skill in save_data["skills"]):
+        problems.append("skills should all be names")
+
+    catalog = get_items()
+    for item_id, entry in save_data["inventory"].items():
+        if isinstance(entry, dict):
+            for field, expected in ITEM_FIELDS.items():
+                if field not in entry:
+                    problems.append(f"item {item_id}: missing {field}")
+                elif not isinstance(entry[field], expected):
+                    problems.append(f"item {item_id}: " + _type_error(field, entry[field], expected))
+        elif isinstance(entry, bool) or not isinstance(entry, int) or entry < 1:
+            problems.append(f"item {item_id}: quantity should be a positive int, not {entry!r}")
+        elif item_id not in catalog:
+            problems.append(f"item {item_id}: not in the catalog")
+
+    if save_data["location"] is not None and location.find_location(save_data["location"]) is None:
+        problems.append(f"unknown location {save_data['location']!r}")
+    return problems
@@ -0,0 +1,97 @@
+# server.py
+
+"""
+Multi-session game server.
+
+Hosts many players in one process on a single asyncio event loop. Each connection gets its
+own session (character, shop and world) and its own event bus, and plays through the same
+menu and combat code as the terminal game, using a line-based text protocol: the server
+sends prompts and messages, and the client sends one command per line.
+
+    python server.py --host 127.0.0.1 --port 4000
+    python client.py --host 127.0.0.1 --port 4000
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import game
+import profiling
+from events import EventBus, TerminalSink, use_bus
+from game import play
+
+
+class SessionClosed(Exception):
+    """The client disconnected in the middle of a game."""
+
+
+class SocketIO:
+    """Line-protocol I/O over an asyncio stream connection."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def ask(self, prompt):
+        self.writer.write(prompt.encode())
+        await self.writer.drain()  # Also applies back-pressure to chatty sessions
+        line = await self.reader.readline()
+        if not line:
+            raise SessionClosed()
+        return line.decode(errors="replace").rstrip("\r\n")
+
+    def say(self, text=""):
+        self.writer.write(text.encode() + b"\n")
+
+
+class GameServer:
+    def __init__(self, host="127.0.0.1", port=4000):
+        self.host = host
+        self.port = port
+        self.sessions = 0  # Currently connected players
+        self.server = None
+
+    async def handle_connection(self, reader, writer):
+        io = SocketIO(reader, writer)
+        self.sessions += 1
+        # Each connection runs in its own task, so this bus only sees this session's events
+        with use_bus(EventBus([TerminalSink(io.say)])):
+            try:
+                await play(io)
+                await writer.drain()
+            except (SessionClosed, ConnectionError):
+                pass
+            finally:
+                self.sessions -= 1
+                writer.close()
+
+    async def start(self):
+        # Saves, loads and save listings wait on the disk (or on SQLite locks); keep them off the event loop
+        game.offload_disk_work(ThreadPoolExecutor(1, thread_name_prefix="saves"))
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        return self.server
+
+    async def serve_forever(self):
+        server = await self.start()
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Adventure server listening on {addresses}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many game sessions in one process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    args = parser.parse_args()
+    if profiling.active and profiling.active.profiles is not None:
+        # Sessions run their commands interleaved, and only one cProfile profiler can be enabled at a time
+        parser.error("ADVENTURE_CPROFILE cannot be used with the server; ADVENTURE_PROFILE alone still times every command")
+    try:
+        asyncio.run(GameServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
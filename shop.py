@@ -1,29 +1,129 @@
 # shop.py
 
-from inventory import Item
+import content
+from catalog import get_item
+from events import emit
+from inventory import ItemStack
+
+
+def parse_order(text):
+    """
+    Parse order text into (item name, quantity) lines. Lines are separated by commas and
+    may give a quantity either way round: "Potion", "Potion x5", "5 Potion".
+    Returns None if a quantity is not a positive number.
+    """
+    order = []
+    for line in text.split(","):
+        line = line.strip()
+        if not line:
+            continue
+        quantity = 1
+        name, _, count = line.rpartition(" x")
+        if name and count.strip().isdigit():
+            line, quantity = name.strip(), int(count)
+        else:
+            count, _, name = line.partition(" ")
+            if name and count.isdigit():
+                line, quantity = name.strip(), int(count)
+        if quantity <= 0:
+            return None
+        order.append((line, quantity))
+    return order
+
+
+def _combine(order):
+    """Merge repeated lines of an order into case-folded name -> total quantity."""
+    totals = {}
+    for item_name, quantity in order:
+        key = item_name.casefold()
+        totals[key] = totals.get(key, 0) + quantity
+    return totals
+
 
 class Shop:
-    def __init__(self):
-        self.items_for_sale = [
-            Item("Potion", "Heals 20 HP.", "heal", price=10),
-            Item("Sword", "Increases attack by 5.", "boost", price=50),
-            Item("Shield", "Increases defense by 5.", "boost", price=50),
-            Item("Winter Coat", "Protects against cold debuff.", "passive", price=75)
-        ]
+    def __init__(self, stock=None):
+        # Case-folded item name -> ItemStack of what is for sale and how many are left
+        self.stock = {}
+        if stock is None:
+            stock = content.load("shop")["starting_stock"]
+        for item_id, quantity in stock.items():
+            item = get_item(item_id)
+            self.stock[item.name.casefold()] = ItemStack(item, quantity)
+
+    @property
+    def items_for_sale(self):
+        return [stack.item for stack in self.stock.values()]
+
+    def stock_of(self, item_name):
+        stack = self.stock.get(item_name.casefold())
+        return stack.quantity if stack else 0
 
     def display_items(self):
-        print("Welcome to the shop! Here are the items for sale:")
-        for item in self.items_for_sale:
-            print(item)
-
-    def buy_item(self, item_name, player):
-        for item in self.items_for_sale:
-            if item.name.lower() == item_name.lower():
-                if player.inventory.gold >= item.price:
-                    player.inventory.gold -= item.price
-                    player.inventory.add_item(item)
-                    print(f"{item.name} purchased for {item.price} gold.")
-                else:
-                    print("Not enough gold to purchase this item.")
-                return
-        print("Item not found in the shop.")
+        emit("shop_welcome")
+        for stack in self.stock.values():
+            availability = f"{stack.quantity} in stock" if stack.quantity else "Sold out"
+            emit("text", text=f"{stack.item} [{availability}]")
+
+    def buy(self, player, order):
+        """
+        Buy every line of `order` (item name, quantity) or nothing at all. Checks that each
+        item is sold here and in stock and that the player can pay for the whole order
+        before any gold or items change hands. Returns True if the purchase went through.
+        """
+        totals = _combine(order)
+        cost = 0
+        for key, quantity in totals.items():
+            stack = self.stock.get(key)
+            if stack is None:
+                emit("shop_item_not_found", item=key)
+                return False
+            if stack.quantity < quantity:
+                emit("out_of_stock", item=stack.item.name, quantity=quantity, stock=stack.quantity)
+                return False
+            cost += stack.item.price * quantity
+        inventory = player.inventory
+        if inventory.gold < cost:
+            emit("not_enough_gold", price=cost, gold=inventory.gold)
+            return False
+
+        inventory.gold -= cost
+        for key, quantity in totals.items():
+            stack = self.stock[key]
+            stack.quantity -= quantity
+            inventory.add_item(stack.item, quantity)
+            emit("item_purchased" if quantity == 1 else "items_purchased", item=stack.item.name,
+                 quantity=quantity, price=stack.item.price * quantity, gold=inventory.gold)
+        return True
+
+    def sell(self, player, order):
+        """
+        Sell every line of `order` (item name, quantity) from the player's inventory, or
+        nothing if any line is not held in that quantity. Items the shop carries go back
+        into its stock. Returns True if the sale went through.
+        """
+        totals = _combine(order)
+        inventory = player.inventory
+        for key, quantity in totals.items():
+            held = inventory.quantity(key)
+            if held == 0:
+                emit("item_not_found", item=key)
+                return False
+            if held < quantity:
+                emit("not_enough_items", item=inventory.get_item(key).name, quantity=quantity, held=held)
+                return False
+
+        for key, quantity in totals.items():
+            item = inventory.take(key, quantity)
+            inventory.gold += item.price * quantity
+            stack = self.stock.get(key)
+            if stack is not None:
+                stack.quantity += quantity
+            emit("item_sold" if quantity == 1 else "items_sold", item=item.name, quantity=quantity,
+                 price=item.price * quantity, gold=inventory.gold)
+        return True
+
+    def buy_item(self, item_name, player, quantity=1):
+        return self.buy(player, [(item_name, quantity)])
+
+    def sell_item(self, item_name, player, quantity=1):
+        return self.sell(player, [(item_name, quantity)])
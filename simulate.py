@@ -0,0 +1,152 @@
+# simulate.py
+
+"""
+Batch combat simulator for balance passes.
+
+Runs large numbers of headless Character vs Enemy fights across a process pool and
+reports win rates, turn counts and the distribution of HP the player has left.
+
+Example:
+    python simulate.py --fights 1000000 --class Warrior --location "Winter Forest"
+"""
+
+import argparse
+import multiprocessing
+import random
+from collections import Counter
+
+from character import Character
+from combat import POLICIES, simulate_fight
+from rng import RandomStream
+from enemy import enemy_pool, enemy_templates, templates_by_location
+from catalog import get_item
+
+CHARACTER_CLASSES = ["Warrior", "Mage", "Rogue", "Archer", "Paladin", "Assassin"]
+CHUNK_SIZE = 10000  # Fights per worker task
+
+
+class BatchResult:
+    def __init__(self, char_class, level, enemy_name, policy):
+        self.char_class = char_class
+        self.level = level
+        self.enemy_name = enemy_name
+        self.policy = policy
+        self.fights = 0
+        self.wins = 0
+        self.total_turns = 0
+        self.turns = Counter()  # Turns taken -> number of fights
+        self.hp_remaining = Counter()  # Player HP left (0 on a loss) -> number of fights
+
+    @property
+    def win_rate(self):
+        return self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def mean_turns(self):
+        return self.total_turns / self.fights if self.fights else 0.0
+
+    def merge(self, wins, total_turns, turns, hp_remaining):
+        self.fights += sum(turns.values())
+        self.wins += wins
+        self.total_turns += total_turns
+        self.turns.update(turns)
+        self.hp_remaining.update(hp_remaining)
+
+    def __repr__(self):
+        return (f"{self.char_class} (Level {self.level}) vs {self.enemy_name} [{self.policy}]: "
+                f"{self.fights} fights, win rate {self.win_rate:.2%}, mean turns {self.mean_turns:.2f}")
+
+
+def build_character(char_class, level=1, potions=0, rng=None):
+    """Create a character at the given level."""
+    player = Character("Simulated", char_class, rng, level=level)
+    if potions:
+        player.inventory.store(get_item("potion"), potions)
+    return player
+
+
+def find_enemy(enemy_name):
+    """Look up the template simulated enemies are spawned from."""
+    for template in enemy_templates.values():
+        if template.name.lower() == enemy_name.lower():
+            return template
+    raise ValueError(f"Unknown enemy: {enemy_name}")
+
+
+def _run_chunk(task):
+    """Worker entry point: run `count` fights and return the aggregated counters."""
+    char_class, level, potions, enemy_name, policy_name, count, seed = task
+    rng = RandomStream(seed)
+    policy = POLICIES[policy_name]
+    template = find_enemy(enemy_name)
+
+    wins = 0
+    total_turns = 0
+    turns = Counter()
+    hp_remaining = Counter()
+    for _ in range(count):
+        player = build_character(char_class, level, potions, rng)
+        enemy = enemy_pool.spawn(template)
+        result = simulate_fight(player, enemy, policy)
+        enemy_pool.release(enemy)
+        wins += result.won
+        total_turns += result.turns
+        turns[result.turns] += 1
+        hp_remaining[max(result.player_hp, 0)] += 1
+    return wins, total_turns, turns, hp_remaining
+
+
+def run_batch(matchups, fights, policy="attack", potions=0, processes=None, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Simulate `fights` fights for every (char_class, level, enemy_name) in `matchups`.
+    Work is split into chunks with their own seeds and spread across a process pool.
+    Returns a list of BatchResult in the same order as `matchups`.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy}")
+    seeder = random.Random(seed)
+
+    results = []
+    tasks = []
+    for index, (char_class, level, enemy_name) in enumerate(matchups):
+        find_enemy(enemy_name)  # Fail early on typos rather than inside a worker
+        results.append(BatchResult(char_class, level, enemy_name, policy))
+        remaining = fights
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            tasks.append((index, (char_class, level, potions, enemy_name, policy, count, seeder.getrandbits(64))))
+            remaining -= count
+
+    with multiprocessing.Pool(processes) as pool:
+        chunks = pool.imap(_run_chunk, [task for _, task in tasks])
+        for (index, _), chunk in zip(tasks, chunks):
+            results[index].merge(*chunk)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless combat simulations in bulk.")
+    parser.add_argument("--fights", type=int, default=100000, help="Fights per matchup")
+    parser.add_argument("--class", dest="char_class", choices=CHARACTER_CLASSES,
+                        help="Character class (default: all classes)")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--location", choices=sorted(templates_by_location),
+                        help="Only fight enemies from this location (default: all locations)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="attack")
+    parser.add_argument("--potions", type=int, default=0, help="Healing potions carried into each fight")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    classes = [args.char_class] if args.char_class else CHARACTER_CLASSES
+    locations = [args.location] if args.location else list(templates_by_location)
+    enemy_names = [template.name for location in locations for template in templates_by_location[location]]
+    matchups = [(char_class, args.level, enemy_name) for char_class in classes for enemy_name in enemy_names]
+
+    results = run_batch(matchups, args.fights, args.policy, args.potions, args.processes, args.seed)
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
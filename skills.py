@@ -0,0 +1,87 @@
+# skills.py
+
+"""
+Skill registry.
+
+Skills are data in content/skills.json: an effect kind plus its numbers. Each definition is
+compiled once into a Skill bound to the effect function for its kind, so using a skill is a
+dictionary lookup and a single call however many skills exist. Damage skills take a batch
+of targets: single-target skills pick one living target, area skills hit all of them with
+the damage worked out once for the whole batch.
+"""
+
+import content
+from events import emit
+from stats import ENCOUNTER, Modifier
+
+
+def _damage(skill, user, targets):
+    living = [target for target in targets if target.is_alive()]
+    if not living:
+        emit("no_skill_targets", name=user.name, skill=skill.name)
+        return False
+    damage = user.attack * skill.power
+    if skill.area:
+        for target in living:
+            target.take_damage(damage)
+        emit("skill_area_damage", name=user.name, skill=skill.name, count=len(living), damage=damage)
+    else:
+        target = user.rng.choice(living)
+        target.take_damage(damage)
+        emit(skill.event, name=user.name, skill=skill.name, target=target.name, damage=damage)
+    return True
+
+
+def _heal(skill, user, targets):
+    user.hp = min(user.max_hp, user.hp + skill.amount)
+    emit("skill_heal", name=user.name, skill=skill.name, amount=skill.amount)
+    return True
+
+
+def _buff(skill, user, targets):
+    # Keyed by the skill, so using it again refreshes the bonus instead of stacking it.
+    # It lasts until the end of the next encounter and is never saved
+    user.stats.add_modifier(Modifier(skill.name, ENCOUNTER, skill.stat, add=skill.amount))
+    emit("skill_buff", name=user.name, skill=skill.name, stat=skill.stat, amount=skill.amount)
+    return True
+
+
+EFFECTS = {
+    "damage": _damage,
+    "heal": _heal,
+    "buff": _buff,
+}
+
+
+class Skill:
+    __slots__ = ("name", "effect", "power", "area", "stat", "amount", "event")
+
+    def __init__(self, name, effect, power=1.0, area=False, stat=None, amount=0, event="skill_damage"):
+        self.name = name
+        self.effect = EFFECTS[effect]  # Raises KeyError for an unknown effect kind
+        self.power = power  # Damage as a multiple of the user's attack
+        self.area = area  # Hits every living target instead of one
+        self.stat = stat  # Stat raised by a buff
+        self.amount = amount  # HP healed or stat points added
+        self.event = event  # Event emitted for single-target damage
+
+    def use(self, user, targets):
+        """Apply the skill. Returns False if it had nothing to act on."""
+        return self.effect(self, user, targets)
+
+    def __repr__(self):
+        return f"Skill({self.name})"
+
+
+def _build():
+    """Compile the skill definitions into SKILLS (skill name -> Skill)."""
+    return {"SKILLS": {name: Skill(name, **definition) for name, definition in content.load("skills").items()}}
+
+
+_content = content.LazyContent(__name__, _build, ("SKILLS",))
+__getattr__ = _content.getattr
+
+
+def get_skill(name):
+    """Return the skill with this name, or None."""
+    return _content.get("SKILLS").get(name)
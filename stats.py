@@ -0,0 +1,106 @@
+# stats.py
+
+"""
+Base stats plus an ordered stack of modifiers.
+
+Equipment, buffs, location effects and combat stances no longer edit attack/defense in
+place. Each one is a Modifier, and the effective values are computed from the base stats
+the first time they are read after a change, then cached. Removing a modifier restores
+exactly what was there before, so travelling back and forth no longer loses points to
+int() rounding.
+"""
+
+# Modifier layers, applied in this order. Within a layer, flat bonuses are added before
+# multipliers are applied; a multiplied stat is rounded down like the old int() effects.
+EQUIPMENT = "equipment"
+BUFF = "buff"  # Lasting boosts, such as attack boost items
+ENCOUNTER = "encounter"  # Skill buffs, which wear off when the next encounter ends
+LOCATION = "location"
+STANCE = "stance"
+LAYERS = (EQUIPMENT, BUFF, ENCOUNTER, LOCATION, STANCE)
+
+# Layers that describe the character rather than where they stand or what they are doing
+PERSISTENT_LAYERS = (EQUIPMENT, BUFF)
+
+
+class Modifier:
+    __slots__ = ("source", "layer", "stat", "add", "multiply")
+
+    def __init__(self, source, layer, stat, add=0, multiply=1.0):
+        self.source = source  # What applied it, e.g. "weapon", "location", "stance", "boost"
+        self.layer = layer
+        self.stat = stat
+        self.add = add
+        self.multiply = multiply
+
+    def __repr__(self):
+        return f"Modifier({self.source}, {self.layer}, {self.stat}, add={self.add}, multiply={self.multiply})"
+
+
+class StatBlock:
+    """Base stats and modifiers; effective values are cached until something changes."""
+    __slots__ = ("base", "_modifiers", "_effective")
+
+    def __init__(self, **base):
+        self.base = base  # Stat name -> base value
+        self._modifiers = {}  # (source, stat) -> Modifier
+        self._effective = None  # Stat name -> effective value, or None when stale
+
+    def __getitem__(self, stat):
+        effective = self._effective
+        if effective is None:
+            effective = self._effective = self._compute(LAYERS)
+        return effective[stat]
+
+    def _compute(self, layers):
+        values = dict(self.base)
+        for layer in layers:
+            multipliers = {}
+            for modifier in self._modifiers.values():
+                if modifier.layer == layer:
+                    values[modifier.stat] += modifier.add
+                    if modifier.multiply != 1.0:
+                        multipliers[modifier.stat] = multipliers.get(modifier.stat, 1.0) * modifier.multiply
+            for stat, multiplier in multipliers.items():
+                values[stat] = int(values[stat] * multiplier)
+        return values
+
+    def persistent(self, stat):
+        """The stat with equipment and buffs, but without location or stance effects (what saves store)."""
+        return self._compute(PERSISTENT_LAYERS)[stat]
+
+    def raise_base(self, stat, amount):
+        self.base[stat] += amount
+        self._effective = None
+
+    def set_base(self, stat, value):
+        self.base[stat] = value
+        self._effective = None
+
+    def add_modifier(self, modifier):
+        """Add a modifier, replacing any earlier one from the same source on the same stat."""
+        self._modifiers[(modifier.source, modifier.stat)] = modifier
+        self._effective = None
+
+    def stack_modifier(self, source, layer, stat, add):
+        """Add `add` on top of an existing flat modifier from this source (e.g. repeated boosts)."""
+        existing = self._modifiers.get((source, stat))
+        total = existing.add + add if existing else add
+        self.add_modifier(Modifier(source, layer, stat, add=total))
+
+    def remove_modifier(self, source, stat):
+        if self._modifiers.pop((source, stat), None) is not None:
+            self._effective = None
+
+    def remove_layer(self, layer):
+        """Remove every modifier in `layer`, e.g. skill buffs once an encounter is over."""
+        kept = {key: modifier for key, modifier in self._modifiers.items() if modifier.layer != layer}
+        if len(kept) != len(self._modifiers):
+            self._modifiers = kept
+            self._effective = None
+
+    def get_modifier(self, source, stat):
+        return self._modifiers.get((source, stat))
+
+    def modifiers(self):
+        return list(self._modifiers.values())
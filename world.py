@@ -0,0 +1,68 @@
+# world.py
+
+"""
+The enemies one player faces, grouped by location.
+
+A World keeps a count of living enemies per location and in total. Enemies report their
+own deaths from take_damage(), so "is this area clear?" and "has the player won?" are
+answered from the counters instead of by checking every enemy after each fight.
+"""
+
+import enemy
+from enemy import enemy_pool
+
+
+class World:
+    def __init__(self, pool=enemy_pool):
+        self.pool = pool
+        self.enemies_by_location = {}  # Location name -> list of enemies, living or dead
+        self.alive_by_location = {}  # Location name -> number of living enemies
+        self.alive = 0  # Living enemies across all locations
+
+    @classmethod
+    def spawn_default(cls, pool=enemy_pool):
+        """A fresh world with every location's standard enemies."""
+        world = cls(pool)
+        for location, templates in enemy.templates_by_location.items():
+            for template in templates:
+                world.spawn(template, location)
+        return world
+
+    def spawn(self, template, location=None):
+        """Spawn an enemy from `template` into `location` (by default, the template's own)."""
+        location = location or template.location
+        enemy = self.pool.spawn(template)
+        enemy.location = location
+        enemy.world = self
+        self.enemies_by_location.setdefault(location, []).append(enemy)
+        self.alive_by_location.setdefault(location, 0)
+        if enemy.is_alive():
+            self.alive_by_location[location] += 1
+            self.alive += 1
+        return enemy
+
+    def enemy_died(self, enemy):
+        """Called by an enemy of this world when its HP drops to zero."""
+        self.alive_by_location[enemy.location] -= 1
+        self.alive -= 1
+
+    def enemies_at(self, location):
+        return self.enemies_by_location.get(location, [])
+
+    def is_clear(self, location):
+        """True if no living enemies are left in `location`."""
+        return self.alive_by_location.get(location, 0) == 0
+
+    def is_won(self):
+        """True once every enemy in the world has been defeated."""
+        return self.alive == 0
+
+    def release(self):
+        """Return every enemy to the pool; the world is empty afterwards."""
+        for enemies in self.enemies_by_location.values():
+            for enemy in enemies:
+                enemy.world = None
+        self.pool.release_all(self.enemies_by_location)
+        self.enemies_by_location = {}
+        self.alive_by_location = {}
+        self.alive = 0